@@ -1,15 +1,20 @@
 import streamlit as st
-import json
 import os
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+import math
+import time
 from datetime import datetime, date, timedelta
-import pandas as pd
-from PIL import Image
-import plotly.express as px
-import plotly.graph_objects as go
-import random
+from concurrent.futures import wait
+
+from hackmate_engine import (
+    AVAILABILITY_OPTIONS, CATEGORIES_FILE, EXPERIENCE_LEVELS, accept_team_request, add_user_profile,
+    assemble_team, calculate_domain_scores, calculate_team_compatibility, create_instant_team_match,
+    create_sample_categories, generate_team_roles, get_all_users, get_domain_score_matrix,
+    get_match_executor, get_profile_filter_index, get_profile_matrix, get_storage,
+    get_team_aggregates, get_user_team_requests, initialize_sample_data, join_team_members,
+    json_transaction, load_json, new_team_name, recommend_team_members, save_quick_team, save_team,
+    save_team_request, save_team_requests, set_error_reporter, start_metrics_dump, team_page,
+    teams_formed_since, timed, timer, update_team_request,
+)
 
 # Configuration
 st.set_page_config(
@@ -157,15 +162,20 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# File paths
-CATEGORIES_FILE = 'categories.json'
-USERS_FILE = 'users.json'
-TEAMS_FILE = 'teams.json'
-QUICK_TEAMS_FILE = 'quick_teams.json'
-HACKATHONS_FILE = 'hackathons.json'
-TEAM_REQUESTS_FILE = 'team_requests.json'
+# Engine errors (unreadable data files and the like) are shown on the page
+set_error_reporter(st.error)
+
+# Page latencies and engine timings go to HACKMATE_METRICS_FILE when it is set
+start_metrics_dump()
+
 UPLOAD_DIR = 'achievement_uploads'
 
+# Page sizes offered on Smart Browse and Find Teams; the first is the default
+PAGE_SIZE_OPTIONS = [10, 25, 50]
+
+# Sort orders offered on Smart Browse when not ranking by a domain score
+BROWSE_SORT_OPTIONS = ["Oldest first", "Newest first", "Name", "Experience"]
+
 # Create upload directory if it doesn't exist
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
@@ -178,205 +188,6 @@ if 'show_create_team' not in st.session_state:
 if 'selected_team' not in st.session_state:
     st.session_state['selected_team'] = None
 
-def load_json(file_path):
-    """Load JSON data from file with error handling"""
-    try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return {}
-    except Exception as e:
-        st.error(f"Error loading {file_path}: {str(e)}")
-        return {}
-
-def save_json(file_path, data):
-    """Save JSON data to file with error handling"""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        st.error(f"Error saving {file_path}: {str(e)}")
-
-def add_user_profile(profile):
-    """Add user profile to the database"""
-    users = load_json(USERS_FILE)
-    users[profile['name']] = profile
-    save_json(USERS_FILE, users)
-
-def get_all_users():
-    """Get all user profiles"""
-    users = load_json(USERS_FILE)
-    return list(users.values())
-
-def save_team(team_data):
-    """Save team data"""
-    teams = load_json(TEAMS_FILE)
-    team_id = f"team_{len(teams) + 1}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    teams[team_id] = team_data
-    save_json(TEAMS_FILE, teams)
-    return team_id
-
-def get_all_teams():
-    """Get all teams"""
-    teams = load_json(TEAMS_FILE)
-    return list(teams.values())
-
-def save_quick_team(quick_team_data):
-    """Save quick team data"""
-    quick_teams = load_json(QUICK_TEAMS_FILE)
-    team_id = f"quick_{len(quick_teams) + 1}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    quick_teams[team_id] = quick_team_data
-    save_json(QUICK_TEAMS_FILE, quick_teams)
-    return team_id
-
-def get_quick_teams():
-    """Get all quick teams"""
-    quick_teams = load_json(QUICK_TEAMS_FILE)
-    return list(quick_teams.values())
-
-def get_team_requests():
-    """Get all team requests"""
-    return load_json(TEAM_REQUESTS_FILE)
-
-def save_team_request(request_data):
-    """Save a team request"""
-    requests = get_team_requests()
-    request_id = f"request_{len(requests) + 1}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-    requests[request_id] = request_data
-    save_json(TEAM_REQUESTS_FILE, requests)
-    return request_id
-
-def update_team_request(request_id, updates):
-    """Update a team request"""
-    requests = get_team_requests()
-    if request_id in requests:
-        requests[request_id].update(updates)
-        save_json(TEAM_REQUESTS_FILE, requests)
-        return True
-    return False
-
-def get_user_team_requests(username):
-    """Get all team requests for a specific user"""
-    requests = get_team_requests()
-    user_requests = []
-    
-    for req_id, req_data in requests.items():
-        if req_data.get('to_user') == username or req_data.get('from_user') == username:
-            user_requests.append((req_id, req_data))
-    
-    return user_requests
-
-def get_team_by_id(team_id):
-    """Get a specific team by ID"""
-    teams = load_json(TEAMS_FILE)
-    return teams.get(team_id)
-
-def update_team(team_id, updates):
-    """Update a team"""
-    teams = load_json(TEAMS_FILE)
-    if team_id in teams:
-        teams[team_id].update(updates)
-        save_json(TEAMS_FILE, teams)
-        return True
-    return False
-
-# ML Skillset Enhancer Functions
-def vectorize_profiles(profiles, all_skills):
-    """Convert profiles to vector representation based on skills"""
-    matrix = []
-    for p in profiles:
-        skills_lower = [s.lower() for s in p.get('skills', [])]
-        row = [1 if skill in skills_lower else 0 for skill in all_skills]
-        matrix.append(row)
-    return np.array(matrix)
-
-def find_best_matches(user_profile, profiles, top_k=5):
-    """Find best matches using cosine similarity"""
-    all_skills = set()
-    for p in profiles:
-        all_skills.update([s.lower() for s in p.get('skills', [])])
-    all_skills.update([s.lower() for s in user_profile.get('skills', [])])
-    all_skills = sorted(list(all_skills))
-
-    if not all_skills:
-        return []
-
-    try:
-        matrix = vectorize_profiles(profiles, all_skills)
-        user_vec = np.array([[1 if s in [sk.lower() for sk in user_profile.get('skills', [])] else 0 for s in all_skills]])
-
-        if matrix.size > 0 and user_vec.size > 0:
-            sims = cosine_similarity(user_vec, matrix)[0]
-            idx_sim = sorted([(i, s) for i, s in enumerate(sims) if s < 0.999], key=lambda x: x[1], reverse=True)[:top_k]
-
-            user_avail = set(user_profile.get('availability', []))
-            matches = []
-            for idx, sim in idx_sim:
-                if idx < len(profiles):
-                    candidate = profiles[idx]
-                    cand_avail = set(candidate.get('availability', []))
-                    # Check overlapping availability
-                    if user_avail and cand_avail and user_avail.isdisjoint(cand_avail):
-                        continue
-                    matches.append((candidate, sim))
-            return matches
-    except Exception as e:
-        st.error(f"Error in finding matches: {str(e)}")
-        return []
-    
-    return []
-
-def analyze_fit(cat_sel, dom_sel, selected_skills, categories):
-    """Analyze skill fit for a specific domain"""
-    if not categories or cat_sel not in categories or dom_sel not in categories[cat_sel]['domains']:
-        return None
-
-    domain_skills = set(s.lower() for s in categories[cat_sel]['domains'][dom_sel])
-    user_skills = set(s.lower() for s in selected_skills)
-
-    matched = user_skills.intersection(domain_skills)
-    missing = domain_skills.difference(user_skills)
-
-    max_score = max(len(domain_skills), 10)
-    score = min(100, (len(matched) / max_score) * 100) if max_score > 0 else 0
-
-    if score >= 80:
-        rec = "Excellent fit! Strong skills for this role."
-    elif score >= 60:
-        rec = f"Good fit; consider improving missing skills: {', '.join(list(missing)[:3])}"
-    elif score >= 40:
-        rec = f"Moderate fit; focus on acquiring key skills: {', '.join(list(missing)[:3])}"
-    else:
-        rec = f"Low fit; strongly recommend gaining these skills: {', '.join(list(missing)[:3])}"
-
-    return {
-        "score": score,
-        "matched": matched,
-        "missing": missing,
-        "recommendation": rec,
-    }
-
-def calculate_domain_scores(user_profile, categories):
-    """Calculate domain match scores for a user"""
-    user_skills = set(skill.lower() for skill in user_profile.get('skills', []))
-    domain_scores = {}
-    
-    for cat, cat_info in categories.items():
-        for domain, skills in cat_info.get("domains", {}).items():
-            domain_skills = set(skill.lower() for skill in skills)
-            if domain_skills:
-                matched = user_skills.intersection(domain_skills)
-                score = (len(matched) / len(domain_skills)) * 100
-                domain_scores[domain] = {
-                    'score': score,
-                    'matched': matched,
-                    'missing': domain_skills - user_skills,
-                    'category': cat
-                }
-    
-    return domain_scores
-
 def get_score_class(score):
     """Get CSS class for score badge"""
     if score >= 80:
@@ -429,12 +240,11 @@ def display_profile_card_with_scores(user, categories, show_scores=True, role=No
         
         with col2:
             if show_scores and categories:
-                domain_scores = calculate_domain_scores(user, categories)
+                best = get_domain_score_matrix(categories).best(user)
                 
-                if domain_scores:
+                if best:
                     # Get the highest scoring domain only
-                    best_domain, best_data = max(domain_scores.items(), key=lambda x: x[1]['score'])
-                    score = best_data['score']
+                    best_domain, score = best
                     score_class = get_score_class(score)
                     score_label = get_score_label(score)
                     
@@ -446,125 +256,78 @@ def display_profile_card_with_scores(user, categories, show_scores=True, role=No
                     </div>
                     """, unsafe_allow_html=True)
 
-def create_instant_team_match(user_profile, hackathon_context=None):
-    """Create instant team matches based on complementary skills and hackathon needs"""
-    users = get_all_users()
-    
-    if len(users) < 2:
-        return None
-    
-    user_skills = set(s.lower() for s in user_profile.get('skills', []))
-    matches = []
-    
-    for candidate in users:
-        if candidate['name'] == user_profile['name']:
-            continue
-            
-        candidate_skills = set(s.lower() for s in candidate.get('skills', []))
-        
-        # Calculate complementary score (different skills are better for teams)
-        complement_score = len(user_skills.symmetric_difference(candidate_skills))
-        overlap_penalty = len(user_skills.intersection(candidate_skills)) * 0.5
-        
-        # Availability match
-        user_avail = set(user_profile.get('availability', []))
-        cand_avail = set(candidate.get('availability', []))
-        avail_score = len(user_avail.intersection(cand_avail)) if user_avail and cand_avail else 0.5
-        
-        # Experience diversity bonus
-        exp_levels = {"Beginner": 1, "Intermediate": 2, "Advanced": 3, "Expert": 4}
-        user_exp = exp_levels.get(user_profile.get('experience_level', 'Intermediate'), 2)
-        cand_exp = exp_levels.get(candidate.get('experience_level', 'Intermediate'), 2)
-        exp_diversity = abs(user_exp - cand_exp) * 0.3  # Reward diversity
-        
-        total_score = complement_score + avail_score * 2 + exp_diversity - overlap_penalty
-        
-        if total_score > 0:
-            matches.append((candidate, total_score))
-    
-    matches.sort(key=lambda x: x[1], reverse=True)
-    return matches[:3]  # Return top 3 matches
+def run_in_match_pool(status, fn, *args, **kwargs):
+    """Run fn on the match pool, showing elapsed time in a st.status until it returns.
 
-def generate_team_roles(team_members, hackathon_theme=None):
-    """Generate optimal role assignments for team members"""
-    roles = {
-        'Team Lead': {'skills': ['leadership', 'project management', 'communication'], 'assigned': None},
-        'Tech Lead': {'skills': ['programming', 'software development', 'architecture'], 'assigned': None},
-        'Designer': {'skills': ['ui/ux', 'design', 'figma', 'adobe', 'graphics'], 'assigned': None},
-        'Backend Dev': {'skills': ['python', 'java', 'node.js', 'database', 'api'], 'assigned': None},
-        'Frontend Dev': {'skills': ['react', 'javascript', 'html', 'css', 'vue'], 'assigned': None},
-        'Data Specialist': {'skills': ['data science', 'machine learning', 'analytics', 'sql'], 'assigned': None},
-        'Business Analyst': {'skills': ['business', 'strategy', 'marketing', 'finance'], 'assigned': None}
-    }
-    
-    # Score each member for each role
-    for role, role_info in roles.items():
-        best_score = 0
-        best_member = None
-        
-        for member in team_members:
-            member_skills = [s.lower() for s in member.get('skills', [])]
-            score = sum(1 for skill in role_info['skills'] if any(skill in ms for ms in member_skills))
-            
-            # Bonus for experience level
-            exp_bonus = {'Expert': 3, 'Advanced': 2, 'Intermediate': 1, 'Beginner': 0.5}
-            score += exp_bonus.get(member.get('experience_level', 'Intermediate'), 1)
-            
-            if score > best_score:
-                best_score = score
-                best_member = member
-        
-        if best_member:
-            roles[role]['assigned'] = best_member['name']
-            roles[role]['score'] = best_score
-    
-    return roles
+    Worker threads have no Streamlit script context, so fn should be pure
+    compute; look up shared resources such as the profile matrix first and
+    pass them in.
+    """
+    future = get_match_executor().submit(fn, *args, **kwargs)
+    progress = status.empty()
+    start = time.perf_counter()
+    while not wait([future], timeout=0.1).done:
+        progress.caption(f"Matching... {time.perf_counter() - start:.1f}s")
+    progress.caption(f"Matched in {time.perf_counter() - start:.2f}s")
+    return future.result()
 
-def calculate_team_compatibility(members):
-    """Calculate overall team compatibility score"""
-    if len(members) < 2:
-        return 0
-    
-    # Skill diversity score
-    all_skills = set()
-    for member in members:
-        all_skills.update(s.lower() for s in member.get('skills', []))
-    
-    total_skills = sum(len(member.get('skills', [])) for member in members)
-    skill_diversity = len(all_skills) / (total_skills + 1) if total_skills > 0 else 0
-    
-    # Experience level balance
-    exp_levels = [member.get('experience_level', 'Intermediate') for member in members]
-    exp_variety = len(set(exp_levels)) / len(exp_levels) if exp_levels else 0
-    
-    # Availability overlap
-    avail_sets = [set(member.get('availability', [])) for member in members if member.get('availability')]
-    if avail_sets:
-        common_avail = set.intersection(*avail_sets) if len(avail_sets) > 1 else avail_sets[0]
-        avail_score = len(common_avail) / 5  # Assuming max 5 availability options
-    else:
-        avail_score = 0.5
-    
-    # Domain diversity
-    domains = set()
-    for member in members:
-        domains.update(member.get('domain', []))
-    domain_diversity = len(domains) / len(members) if members else 0
+def offset_page(items, key, page_size, reset_on=None):
+    """Items on the current page of a list, with a page picker above them.
+
+    The page goes back to the first one whenever reset_on (say, the active
+    filters) changes.
+    """
+    page_count = max(1, math.ceil(len(items) / page_size))
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_reset_on") != reset_on:
+        st.session_state[f"{key}_reset_on"] = reset_on
+        st.session_state[page_key] = 1
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), page_count)
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key=page_key)
+    start = (page - 1) * page_size
+    return items[start:start + page_size]
+
+def cursor_page(key, fetch, page_size, reset_on=None):
+    """Items on the current page of a cursor-paged list, with Previous/Next buttons.
+
+    fetch(cursor, limit) returns (items, next_cursor) like storage.page. The
+    cursors of the pages visited so far are kept in session state, so
+    Previous can step back without counting from the start.
+    """
+    cursors_key = f"{key}_cursors"
+    if st.session_state.get(f"{key}_reset_on") != reset_on or cursors_key not in st.session_state:
+        st.session_state[f"{key}_reset_on"] = reset_on
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+    items, next_cursor = fetch(cursors[-1], page_size)
     
-    total_score = (skill_diversity * 0.4 + exp_variety * 0.2 + avail_score * 0.2 + domain_diversity * 0.2) * 100
-    return min(100, total_score)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursors) > 1 and st.button("← Previous", key=f"{key}_previous"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.markdown(f"Page {len(cursors)}")
+    with col3:
+        if next_cursor is not None and st.button("Next →", key=f"{key}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+    return items
 
+@timed
 def show_browse_users_with_ml():
     """Enhanced user browsing with ML-powered domain scoring - FIXED VERSION"""
     st.markdown("## 👥 Browse Hackers with Smart Matching")
     
-    users = get_all_users()
+    users = get_storage().all('users')
     categories = load_json(CATEGORIES_FILE)
     
     if not users:
         st.info("No users registered yet. Be the first!")
         return
     
+    filter_index = get_profile_filter_index()
+    
     # Enhanced filters with ML features
     col1, col2, col3, col4 = st.columns(4)
     
@@ -575,14 +338,15 @@ def show_browse_users_with_ml():
         experience_filter = st.selectbox("📈 Min Experience", ["Any", "Beginner", "Intermediate", "Advanced", "Expert"])
     
     with col3:
-        all_domains = set()
-        for user in users:
-            all_domains.update(user.get('domain', []))
-        domain_filter = st.selectbox("🎯 Domain Filter", ["Any"] + sorted(list(all_domains)))
+        domain_filter = st.selectbox("🎯 Domain Filter", ["Any"] + filter_index.values('domain'))
     
     with col4:
         min_domain_score = st.slider("🎯 Min Domain Score", 0, 100, 0, help="Minimum domain match score")
     
+    skills_filter = [s.strip() for s in st.text_input(
+        "🛠 Has Skills", placeholder="e.g. Python, React", help="Show only users with all of these skills"
+    ).split(',') if s.strip()]
+    
     # Domain-based matching
     search_domain = ""
     if categories:
@@ -598,24 +362,21 @@ def show_browse_users_with_ml():
                 search_domain = st.selectbox("Search by Domain", [""] + domain_options)
     
     # Apply filters
-    filtered_users = users.copy()
-    
-    if available_now:
-        filtered_users = [u for u in filtered_users if 'Flexible' in u.get('availability', []) or 'Right Now' in u.get('availability', [])]
-    
-    if experience_filter != "Any":
-        filtered_users = [u for u in filtered_users if u.get('experience_level') == experience_filter]
-    
-    if domain_filter != "Any":
-        filtered_users = [u for u in filtered_users if domain_filter in u.get('domain', [])]
+    # The index can be a write ahead of the users read above; skip ids it has that users lacks
+    filtered_users = [users[user_id] for user_id in filter_index.query(
+        domain=None if domain_filter == "Any" else domain_filter,
+        experience=None if experience_filter == "Any" else experience_filter,
+        availability=['Flexible', 'Right Now'] if available_now else None,
+        skills=skills_filter) if user_id in users]
     
     # Filter by domain score if ML search is active
     if categories and search_domain and min_domain_score > 0:
         scored_users = []
+        domain_matrix = get_domain_score_matrix(categories)
         for user in filtered_users:
-            domain_scores = calculate_domain_scores(user, categories)
-            if search_domain in domain_scores and domain_scores[search_domain]['score'] >= min_domain_score:
-                scored_users.append((user, domain_scores[search_domain]['score']))
+            score = domain_matrix.score(user, search_domain)
+            if score is not None and score >= min_domain_score:
+                scored_users.append((user, score))
         
         # Sort by domain score
         scored_users.sort(key=lambda x: x[1], reverse=True)
@@ -627,15 +388,33 @@ def show_browse_users_with_ml():
     if search_domain and categories:
         st.info(f"🎯 Showing users ranked by {search_domain} domain expertise")
     
-    for i, user in enumerate(filtered_users):
+    ranked = categories and search_domain and min_domain_score > 0
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_key = BROWSE_SORT_OPTIONS[0] if ranked else st.selectbox("Sort by", BROWSE_SORT_OPTIONS)
+    with col2:
+        page_size = st.selectbox("Per page", PAGE_SIZE_OPTIONS, key="browse_page_size")
+    
+    if sort_key == "Newest first":
+        filtered_users = filtered_users[::-1]
+    elif sort_key == "Name":
+        filtered_users = sorted(filtered_users, key=lambda u: u['name'].casefold())
+    elif sort_key == "Experience":
+        filtered_users = sorted(filtered_users, key=lambda u: -EXPERIENCE_LEVELS.get(u.get('experience_level'), 2))
+    
+    # Only the cards on this page are scored and drawn
+    page_users = offset_page(filtered_users, "browse", page_size, reset_on=(
+        available_now, experience_filter, domain_filter, tuple(skills_filter), min_domain_score, search_domain,
+        sort_key, page_size))
+    
+    for i, user in enumerate(page_users):
         col1, col2 = st.columns([4, 1])
         
         with col1:
             # Show domain score for searched domain only if searching
             if search_domain and categories:
-                domain_scores = calculate_domain_scores(user, categories)
-                if search_domain in domain_scores:
-                    score = domain_scores[search_domain]['score']
+                score = get_domain_score_matrix(categories).score(user, search_domain)
+                if score is not None:
                     score_class = get_score_class(score)
                     score_label = get_score_label(score)
                     st.markdown(f"""
@@ -656,7 +435,7 @@ def show_browse_users_with_ml():
                     st.success(f"✅ Team formed with {user['name']}!")
                     # Store the team formation
                     team_data = {
-                        'name': f"QuickTeam_{datetime.now().strftime('%H%M%S')}",
+                        'name': new_team_name("QuickTeam"),
                         'members': [user] + [match[0] for match in matches[:2]],
                         'formation_time': datetime.now().strftime('%H:%M:%S'),
                         'compatibility': calculate_team_compatibility([user] + [match[0] for match in matches[:2]]),
@@ -691,6 +470,7 @@ def show_browse_users_with_ml():
                                 </div>
                                 """, unsafe_allow_html=True)
 
+@timed
 def show_group_management():
     """Manage groups and categories"""
     st.markdown("## 🏢 Group & Category Management")
@@ -714,11 +494,15 @@ def show_group_management():
                             st.markdown(f"**{domain}**")
                             st.write(f"Skills: {', '.join(skills)}")
                             if st.button(f"Delete {domain}", key=f"del_{category}_{domain}"):
-                                if category in categories and domain in categories[category]["domains"]:
-                                    del categories[category]["domains"][domain]
-                                    if not categories[category]["domains"]:
-                                        del categories[category]
-                                    save_json(CATEGORIES_FILE, categories)
+                                with json_transaction(CATEGORIES_FILE) as latest:
+                                    domains = dict(latest.get(category, {}).get("domains", {}))
+                                    deleted = domains.pop(domain, None) is not None
+                                    if deleted:
+                                        if domains:
+                                            latest[category] = {**latest[category], "domains": domains}
+                                        else:
+                                            del latest[category]
+                                if deleted:
                                     st.success(f"Deleted {domain} from {category}")
                                     st.rerun()
     
@@ -739,14 +523,16 @@ def show_group_management():
                     new_dom = new_dom.strip()
                     sk_list = [s.strip() for s in new_sk.split(",") if s.strip()]
                     
-                    if new_cat not in categories:
-                        categories[new_cat] = {"domains": {}}
+                    with json_transaction(CATEGORIES_FILE) as latest:
+                        domains = dict(latest.get(new_cat, {}).get("domains", {}))
+                        exists = new_dom in domains
+                        if not exists:
+                            domains[new_dom] = sk_list
+                            latest[new_cat] = {**latest.get(new_cat, {}), "domains": domains}
                     
-                    if new_dom in categories[new_cat]["domains"]:
+                    if exists:
                         st.warning(f"Domain '{new_dom}' already exists in '{new_cat}'.")
                     else:
-                        categories[new_cat]["domains"][new_dom] = sk_list
-                        save_json(CATEGORIES_FILE, categories)
                         st.success(f"Added '{new_dom}' under '{new_cat}'.")
 
 def show_create_team_form():
@@ -831,22 +617,24 @@ def show_create_team_form():
             
             # Send join requests to selected members if private team
             if team_privacy != "Public - Anyone can join":
-                for member in team_members:
-                    request_data = {
-                        'team_id': team_id,
-                        'team_name': team_name,
-                        'from_user': "System",  # Or the creator's name if available
-                        'to_user': member['name'],
-                        'status': 'pending',
-                        'message': f"You've been invited to join {team_name}",
-                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    save_team_request(request_data)
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                # One write for all the invitations
+                save_team_requests([{
+                    'team_id': team_id,
+                    'team_name': team_name,
+                    'type': 'invitation',
+                    'from_user': "System",  # Or the creator's name if available
+                    'to_user': member['name'],
+                    'status': 'pending',
+                    'message': f"You've been invited to join {team_name}",
+                    'timestamp': timestamp
+                } for member in team_members])
                 
                 st.info("📨 Join requests sent to selected members!")
             
             st.session_state['show_create_team'] = False
 
+@timed
 def show_team_requests(username):
     """Show team requests for a user"""
     st.markdown("## 📨 Team Requests")
@@ -876,7 +664,7 @@ def show_team_requests(username):
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"✅ Accept", key=f"accept_{req_id}"):
-                    update_team_request(req_id, {'status': 'accepted'})
+                    accept_team_request(req_id, request)
                     st.success("Request accepted!")
                     st.rerun()
             with col2:
@@ -944,7 +732,7 @@ def main():
         show_quick_teams_page()
     elif page == "👤 Create Profile":
         show_create_profile_page(categories)
-    elif page == "🔍 Find Teams":
+    elif page == "🔍 Find/Create Teams":
         show_find_teams_page()
     elif page == "📊 Team Analytics":
         show_team_analytics_page()
@@ -964,19 +752,19 @@ def main():
     if st.session_state.get('show_instant_match', False):
         show_instant_team_match()
 
+@timed
 def show_home_page():
     """Enhanced home page with quick team stats"""
     col1, col2, col3, col4 = st.columns(4)
     
-    users = get_all_users()
-    teams = get_all_teams()
-    quick_teams = get_quick_teams()
+    user_count = get_storage().count('users')
+    aggregates = get_team_aggregates()
     
     with col1:
         st.markdown(f"""
         <div class="metric-card">
             <h2>👥</h2>
-            <h3>{len(users)}</h3>
+            <h3>{user_count}</h3>
             <p>Active Hackers</p>
         </div>
         """, unsafe_allow_html=True)
@@ -985,7 +773,7 @@ def show_home_page():
         st.markdown(f"""
         <div class="metric-card">
             <h2>⚡</h2>
-            <h3>{len(quick_teams)}</h3>
+            <h3>{aggregates.counts['quick_teams']}</h3>
             <p>Quick Teams Formed</p>
         </div>
         """, unsafe_allow_html=True)
@@ -1030,14 +818,16 @@ def show_home_page():
             st.rerun()
     
     # Recent quick teams
-    if quick_teams:
+    if aggregates.recent_quick_teams:
         st.markdown("## 🔥 Recently Formed Quick Teams")
-        for team in quick_teams[-3:]:
+        for team in list(aggregates.recent_quick_teams):
             display_quick_team_card(team)
 
 def display_quick_team_card(team_data):
     """Display quick team formation card"""
-    compatibility = calculate_team_compatibility(team_data.get('members', []))
+    compatibility = team_data.get('compatibility')
+    if compatibility is None:
+        compatibility = calculate_team_compatibility(team_data.get('members', []))
     urgency_class = "urgent-badge" if team_data.get('urgency', 'normal') == 'high' else ""
     
     st.markdown(f"""
@@ -1050,6 +840,7 @@ def display_quick_team_card(team_data):
     </div>
     """, unsafe_allow_html=True)
 
+@timed
 def show_quick_teams_page():
     """Enhanced quick team formation page"""
     st.markdown("## ⚡ CYHI Quick Teams - Form Teams in Minutes!")
@@ -1078,7 +869,7 @@ def show_quick_teams_page():
             <h3>👥 Teams Formed</h3>
             <h2>{}</h2>
         </div>
-        """.format(len(get_quick_teams())), unsafe_allow_html=True)
+        """.format(get_team_aggregates().counts['quick_teams']), unsafe_allow_html=True)
     
     # Quick team formation form
     st.markdown("### 🚀 Form Your Team Now")
@@ -1107,71 +898,70 @@ def show_quick_teams_page():
                                    placeholder="Briefly describe what you want to build...")
         
         match_button = st.form_submit_button("⚡ FIND MY TEAM NOW!", use_container_width=True)
-        
-        if match_button:
-            user_profile = next((u for u in users if u['name'] == user_name), None)
-            if user_profile:
-                with st.spinner("🔍 Finding your perfect teammates..."):
-                    import time
-                    time.sleep(2)
-                    
-                    matches = create_instant_team_match(user_profile)
-                    
-                    if matches:
-                        st.success("🎉 Team formed successfully!")
-                        
-                        team_members = [user_profile] + [match[0] for match in matches[:team_size-1]]
-                        roles = generate_team_roles(team_members, focus_area)
-                        compatibility = calculate_team_compatibility(team_members)
-                        
-                        quick_team_data = {
-                            'name': f"QuickTeam_{datetime.now().strftime('%H%M%S')}",
-                            'members': team_members,
-                            'goal': project_idea or f"Build amazing {focus_area} solution",
-                            'focus_area': focus_area,
-                            'urgency': urgency,
-                            'target_size': team_size,
-                            'formation_time': datetime.now().strftime('%H:%M:%S'),
-                            'compatibility': compatibility,
-                            'roles': roles,
-                            'time_commitment': time_commitment
-                        }
-                        
-                        team_id = save_quick_team(quick_team_data)
-                        
-                        st.markdown(f"""
-                        ### 🏆 Your Team: QuickTeam_{datetime.now().strftime('%H%M%S')}
-                        *🔥 Compatibility Score: {compatibility:.0f}%*
-                        """)
-                        
-                        categories = load_json(CATEGORIES_FILE)
-                        for i, member in enumerate(team_members):
-                            role = None
-                            for role_name, role_info in roles.items():
-                                if role_info.get('assigned') == member['name']:
-                                    role = role_name
-                                    break
-                            display_profile_card_with_scores(member, categories, show_scores=True, role=role)
-                        
-                        # Next steps
-                        st.markdown("### 🚀 Next Steps:")
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            if st.button("💬 Start Team Chat"):
-                                st.info("Team chat initiated!")
-                        
-                        with col2:
-                            if st.button("📋 Create Project Board"):
-                                st.info("Project board created!")
-                        
-                        with col3:
-                            if st.button("📅 Schedule Kickoff"):
-                                st.info("Kickoff meeting scheduled!")
-                    
-                    else:
-                        st.warning("No compatible teammates found right now. Try adjusting your preferences!")
+    
+    # Results render outside the form so the next-step buttons are allowed
+    if match_button:
+        user_profile = next((u for u in users if u['name'] == user_name), None)
+        if user_profile:
+            with st.status("🔍 Finding your perfect teammates...") as status:
+                team_members, compatibility = run_in_match_pool(status, assemble_team, user_profile, team_size,
+                                                                matrix=get_profile_matrix())
+                status.update(label=f"🔍 Found {len(team_members) - 1} teammates", state="complete")
+            
+            if len(team_members) > 1:
+                st.success("🎉 Team formed successfully!")
+                
+                roles = generate_team_roles(team_members, focus_area)
+                
+                quick_team_data = {
+                    'name': new_team_name("QuickTeam"),
+                    'members': team_members,
+                    'goal': project_idea or f"Build amazing {focus_area} solution",
+                    'focus_area': focus_area,
+                    'urgency': urgency,
+                    'target_size': team_size,
+                    'formation_time': datetime.now().strftime('%H:%M:%S'),
+                    'compatibility': compatibility,
+                    'roles': roles,
+                    'time_commitment': time_commitment
+                }
+                
+                team_id = save_quick_team(quick_team_data)
+                
+                st.markdown(f"""
+                ### 🏆 Your Team: {quick_team_data['name']}
+                *🔥 Compatibility Score: {compatibility:.0f}%*
+                """)
+                
+                categories = load_json(CATEGORIES_FILE)
+                for i, member in enumerate(team_members):
+                    role = None
+                    for role_name, role_info in roles.items():
+                        if role_info.get('assigned') == member['name']:
+                            role = role_name
+                            break
+                    display_profile_card_with_scores(member, categories, show_scores=True, role=role)
+                
+                # Next steps
+                st.markdown("### 🚀 Next Steps:")
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    if st.button("💬 Start Team Chat"):
+                        st.info("Team chat initiated!")
+                
+                with col2:
+                    if st.button("📋 Create Project Board"):
+                        st.info("Project board created!")
+                
+                with col3:
+                    if st.button("📅 Schedule Kickoff"):
+                        st.info("Kickoff meeting scheduled!")
+            
+            else:
+                st.warning("No compatible teammates found right now. Try adjusting your preferences!")
 
+@timed
 def show_create_profile_page(categories):
     """Enhanced profile creation with team formation focus"""
     st.markdown("## 👤 Create Your Hacker Profile")
@@ -1193,9 +983,7 @@ def show_create_profile_page(categories):
             experience_level = st.selectbox("📈 Experience Level *", 
                                           ["Beginner", "Intermediate", "Advanced", "Expert"])
             
-            availability = st.multiselect("⏰ Availability *", 
-                                        ["Right Now", "Weekends", "Evenings", "Flexible", 
-                                         "Full-time", "Part-time", "Remote Only"])
+            availability = st.multiselect("⏰ Availability *", AVAILABILITY_OPTIONS)
         
         with col2:
             skills_input = st.text_area("🛠 Skills *", 
@@ -1267,38 +1055,43 @@ def show_create_profile_page(categories):
                 st.success("✅ Profile created successfully!")
                 
                 # Immediate team matching for new users
+                st.session_state['profile_matches'] = None
                 if quick_team_opt_in and len(get_all_users()) > 1:
-                    st.markdown("## ⚡ Instant Team Matches Available!")
-                    
-                    with st.spinner("Finding your perfect teammates..."):
-                        import time
-                        time.sleep(1.5)
-                        
-                        matches = create_instant_team_match(profile)
-                        
-                        if matches:
-                            st.success(f"🎉 Found {len(matches)} potential teammates!")
-                            
-                            for i, (match_user, score) in enumerate(matches[:3]):
-                                col1, col2 = st.columns([3, 1])
-                                
-                                with col1:
-                                    display_profile_card_with_scores(match_user, categories, show_scores=True)
-                                
-                                with col2:
-                                    st.markdown("<br><br>", unsafe_allow_html=True)
-                                    if st.button(f"⚡ Team Up!", key=f"team_up_{i}"):
-                                        team_members = [profile, match_user]
-                                        team_data = {
-                                            'name': f"InstantTeam_{datetime.now().strftime('%H%M%S')}",
-                                            'members': team_members,
-                                            'formation_time': datetime.now().strftime('%H:%M:%S'),
-                                            'compatibility': calculate_team_compatibility(team_members),
-                                            'type': 'instant_match'
-                                        }
-                                        save_quick_team(team_data)
-                                        st.success("🎉 Instant team formed! Check Quick Teams page.")
+                    with st.status("Finding your perfect teammates...") as status:
+                        matches = run_in_match_pool(status, create_instant_team_match, profile,
+                                                    matrix=get_profile_matrix())
+                        status.update(label=f"Found {len(matches or [])} potential teammates", state="complete")
+                    st.session_state['profile_matches'] = (profile, matches)
+    
+    # Matches are kept in the session so the Team Up buttons still work on the next run
+    if st.session_state.get('profile_matches'):
+        profile, matches = st.session_state['profile_matches']
+        st.markdown("## ⚡ Instant Team Matches Available!")
+        
+        if matches:
+            st.success(f"🎉 Found {len(matches)} potential teammates!")
+            
+            for i, (match_user, score) in enumerate(matches[:3]):
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    display_profile_card_with_scores(match_user, categories, show_scores=True)
+                
+                with col2:
+                    st.markdown("<br><br>", unsafe_allow_html=True)
+                    if st.button(f"⚡ Team Up!", key=f"team_up_{i}"):
+                        team_members = [profile, match_user]
+                        team_data = {
+                            'name': new_team_name("InstantTeam"),
+                            'members': team_members,
+                            'formation_time': datetime.now().strftime('%H:%M:%S'),
+                            'compatibility': calculate_team_compatibility(team_members),
+                            'type': 'instant_match'
+                        }
+                        save_quick_team(team_data)
+                        st.success("🎉 Instant team formed! Check Quick Teams page.")
 
+@timed
 def show_instant_team_match():
     """Handle instant team matching popup"""
     st.markdown("## ⚡ Instant Team Match")
@@ -1326,7 +1119,7 @@ def show_instant_team_match():
                     
                     if st.button("🤝 Form Team Now!"):
                         team_data = {
-                            'name': f"InstantMatch_{datetime.now().strftime('%H%M%S')}",
+                            'name': new_team_name("InstantMatch"),
                             'members': [user_profile, best_match[0]],
                             'formation_time': datetime.now().strftime('%H:%M:%S'),
                             'type': 'instant_match'
@@ -1342,6 +1135,20 @@ def show_instant_team_match():
             st.session_state['show_instant_match'] = False
             st.rerun()
 
+def show_member_suggestions(team_id, open_slots):
+    """Users who would best fill a team's open slots, with the focus-area skills they bring"""
+    suggestions = recommend_team_members(team_id, top_k=max(3, open_slots))
+    if not suggestions:
+        st.info("Nobody would raise this team's compatibility right now.")
+        return
+    st.markdown("*✨ Suggested Members:*")
+    for profile, score, covered in suggestions:
+        line = f"- 👤 **{profile['name']}** (+{score:.0f} pts; {', '.join(profile.get('skills', [])[:3])})"
+        if covered:
+            line += f" brings {', '.join(covered)}"
+        st.markdown(line)
+
+@timed
 def show_find_teams_page():
     """Enhanced team finding page with create team option"""
     st.markdown("## 🔍 Find & Join Teams")
@@ -1358,32 +1165,46 @@ def show_find_teams_page():
             st.rerun()
         return
     
-    teams = get_all_teams()
-    quick_teams = get_quick_teams()
-    all_teams = teams + quick_teams
+    aggregates = get_team_aggregates()
     
-    if not all_teams:
+    if not aggregates.total:
         st.info("No teams available yet. Create one!")
         return
     
     # Quick stats
     col1, col2, col3 = st.columns(3)
     with col1:
-        active_teams = len([t for t in all_teams if t.get('status', 'active') == 'active'])
-        st.metric("🔥 Active Teams", active_teams)
+        st.metric("🔥 Active Teams", aggregates.active)
     
     with col2:
-        looking_for_members = len([t for t in all_teams if len(t.get('members', [])) < t.get('target_size', 4)])
-        st.metric("👥 Looking for Members", looking_for_members)
+        st.metric("👥 Looking for Members", aggregates.looking_for_members)
     
     with col3:
-        avg_compatibility = sum(t.get('compatibility', 0) for t in all_teams) / len(all_teams) if all_teams else 0
-        st.metric("🎯 Avg Compatibility", f"{avg_compatibility:.0f}%")
+        st.metric("🎯 Avg Compatibility", f"{aggregates.average_compatibility:.0f}%")
     
     # Display teams
     st.markdown("### 🚀 Available Teams")
     
-    for team in all_teams:
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_key = st.selectbox("Sort by", ["Oldest first", "Newest first", "Highest compatibility"],
+                                key="find_teams_sort")
+    with col2:
+        page_size = st.selectbox("Per page", PAGE_SIZE_OPTIONS, key="find_teams_page_size")
+    
+    if sort_key == "Highest compatibility":
+        all_teams = list(get_storage().all('teams').items()) + list(get_storage().all('quick_teams').items())
+        all_teams.sort(key=lambda item: item[1].get('compatibility', 0), reverse=True)
+        page_teams = offset_page(all_teams, "find_teams", page_size, reset_on=(sort_key, page_size))
+    else:
+        page_teams = cursor_page(
+            "find_teams",
+            lambda cursor, limit: team_page(cursor, limit, newest_first=sort_key == "Newest first"),
+            page_size, reset_on=(sort_key, page_size))
+    # Members are looked up for the teams on this page only
+    page_teams = zip([team_id for team_id, _ in page_teams], join_team_members([team for _, team in page_teams]))
+    
+    for team_id, team in page_teams:
         team_name = team.get('name', 'Unnamed Team')
         members = team.get('members', [])
         target_size = team.get('target_size', len(members))
@@ -1410,16 +1231,17 @@ def show_find_teams_page():
             
             # Join team button
             if len(members) < target_size:
-                col1, col2, col3 = st.columns(3)
+                col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    if st.button(f"🤝 Request to Join", key=f"join_{team_name}"):
+                    if st.button(f"🤝 Request to Join", key=f"join_{team_id}"):
                         # For demo, using first user as current user
                         users = get_all_users()
                         if users:
                             current_user = users[0]['name']
                             request_data = {
-                                'team_id': team.get('id', 'unknown'),
+                                'team_id': team_id,
                                 'team_name': team_name,
+                                'type': 'join',
                                 'from_user': current_user,
                                 'to_user': "Team Owner",  # In a real app, this would be the team creator
                                 'status': 'pending',
@@ -1430,13 +1252,20 @@ def show_find_teams_page():
                             st.success(f"✅ Join request sent to {team_name}!")
                 
                 with col2:
-                    if st.button(f"💬 Contact Team", key=f"contact_team_{team_name}"):
+                    if st.button(f"💬 Contact Team", key=f"contact_team_{team_id}"):
                         st.info(f"📧 Message sent to {team_name} team!")
                 
                 with col3:
-                    if st.button(f"🔍 View Details", key=f"details_team_{team_name}"):
+                    if st.button(f"🔍 View Details", key=f"details_team_{team_id}"):
                         st.session_state['selected_team'] = team
                         st.rerun()
+                
+                with col4:
+                    if st.button("✨ Suggest Members", key=f"suggest_team_{team_id}"):
+                        st.session_state['suggest_team'] = team_id
+                
+                if st.session_state.get('suggest_team') == team_id:
+                    show_member_suggestions(team_id, target_size - len(members))
             else:
                 st.info("🔒 Team is full")
         
@@ -1467,16 +1296,16 @@ def show_find_teams_page():
             st.session_state['selected_team'] = None
             st.rerun()
 
+@timed
 def show_team_analytics_page():
     """Simplified team analytics dashboard"""
+    with timer('import plotly'):
+        import plotly.express as px  # only this page draws charts; keep plotly off the other pages' path
     st.markdown("## 📊 Team Formation Analytics")
     
-    users = get_all_users()
-    quick_teams = get_quick_teams()
-    teams = get_all_teams()
-    all_teams = quick_teams + teams
+    aggregates = get_team_aggregates()
     
-    if not users or not all_teams:
+    if not get_storage().count('users') or not aggregates.total:
         st.info("📈 Create some teams to see analytics!")
         return
     
@@ -1484,29 +1313,27 @@ def show_team_analytics_page():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_teams = len(all_teams)
-        st.metric("👥 Total Teams", total_teams)
+        st.metric("👥 Total Teams", aggregates.total)
     
     with col2:
-        avg_team_size = sum(len(team.get('members', [])) for team in all_teams) / len(all_teams) if all_teams else 0
-        st.metric("📊 Avg Team Size", f"{avg_team_size:.1f}")
+        st.metric("📊 Avg Team Size", f"{aggregates.average_size:.1f}")
     
     with col3:
-        avg_compatibility = sum(team.get('compatibility', 0) for team in all_teams) / len(all_teams) if all_teams else 0
-        st.metric("🔥 Avg Compatibility", f"{avg_compatibility:.0f}%")
+        st.metric("🔥 Avg Compatibility", f"{aggregates.average_compatibility:.0f}%")
     
     with col4:
         success_rate = 89
         st.metric("🎯 Success Rate", f"{success_rate}%")
     
+    st.caption(f"⏱ {teams_formed_since(datetime.now() - timedelta(hours=1))} teams formed in the last hour")
+    
     # Simple charts
     col1, col2 = st.columns(2)
     
     with col1:
         # Team size distribution
-        team_sizes = [len(team.get('members', [])) for team in all_teams]
-        if team_sizes:
-            size_counts = {size: team_sizes.count(size) for size in set(team_sizes)}
+        size_counts = aggregates.size_counts
+        if size_counts:
             fig = px.bar(x=list(size_counts.keys()), y=list(size_counts.values()),
                         title="📊 Team Size Distribution",
                         labels={'x': 'Team Size', 'y': 'Number of Teams'})
@@ -1514,9 +1341,7 @@ def show_team_analytics_page():
     
     with col2:
         # Team types
-        quick_count = len(quick_teams)
-        regular_count = len(teams)
-        fig = px.pie(values=[quick_count, regular_count], 
+        fig = px.pie(values=[aggregates.counts['quick_teams'], aggregates.counts['teams']], 
                     names=['Quick Teams', 'Regular Teams'],
                     title="⚡ Team Formation Types")
         st.plotly_chart(fig, use_container_width=True)
@@ -1524,153 +1349,13 @@ def show_team_analytics_page():
     # Top skills analysis
     st.markdown("### 🎯 Top Skills in Teams")
     
-    all_skills = {}
-    for team in all_teams:
-        for member in team.get('members', []):
-            for skill in member.get('skills', []):
-                all_skills[skill] = all_skills.get(skill, 0) + 1
-    
-    if all_skills:
-        # Get top 10 skills
-        top_skills = sorted(all_skills.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        skills_df = pd.DataFrame(top_skills, columns=['Skill', 'Count'])
-        fig = px.bar(skills_df, x='Count', y='Skill', orientation='h',
+    top_skills = aggregates.top_skills(10)
+    if top_skills:
+        skills, counts = zip(*top_skills)
+        fig = px.bar(x=counts, y=skills, orientation='h', labels={'x': 'Count', 'y': 'Skill'},
                     title="🏆 Most Common Skills in Teams")
         st.plotly_chart(fig, use_container_width=True)
 
-def create_sample_categories():
-    """Create sample categories"""
-    sample_categories = {
-        "Technology": {
-            "domains": {
-                "Web Development": ["HTML", "CSS", "JavaScript", "React", "Vue.js", "Node.js", "Python", "Django", "Flask"],
-                "Mobile Development": ["Flutter", "React Native", "Swift", "Kotlin", "Android", "iOS", "Xamarin"],
-                "AI/ML": ["Python", "TensorFlow", "PyTorch", "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Science"],
-                "Blockchain": ["Solidity", "Web3", "DeFi", "Smart Contracts", "Ethereum", "Bitcoin", "Cryptocurrency"],
-                "Game Development": ["Unity", "Unreal Engine", "C#", "C++", "GameMaker", "Godot", "Blender"],
-                "Data Science": ["Python", "R", "SQL", "Pandas", "NumPy", "Matplotlib", "Jupyter", "Statistics"],
-                "DevOps": ["Docker", "Kubernetes", "AWS", "Azure", "CI/CD", "Jenkins", "Git", "Linux"],
-                "Cybersecurity": ["Penetration Testing", "Network Security", "Cryptography", "Ethical Hacking", "OWASP"]
-            }
-        },
-        "Business & Strategy": {
-            "domains": {
-                "Product Management": ["Product Strategy", "User Research", "Agile", "Scrum", "Analytics", "Roadmapping"],
-                "Marketing": ["Digital Marketing", "SEO", "Content Marketing", "Social Media", "Email Marketing", "PPC"],
-                "Finance": ["Financial Analysis", "Accounting", "Investment", "Risk Management", "Budgeting", "FinTech"],
-                "Sales": ["Lead Generation", "CRM", "Sales Strategy", "Negotiation", "Customer Relations"],
-                "Strategy": ["Business Planning", "Market Research", "Consulting", "Competitive Analysis"]
-            }
-        },
-        "Design & Creative": {
-            "domains": {
-                "UI/UX Design": ["Figma", "Adobe XD", "Sketch", "Prototyping", "User Research", "Wireframing"],
-                "Graphic Design": ["Adobe Photoshop", "Adobe Illustrator", "InDesign", "Canva", "Branding"],
-                "Video Production": ["Adobe Premiere", "After Effects", "Final Cut Pro", "Video Editing", "Animation"],
-                "3D Design": ["Blender", "Maya", "3ds Max", "Cinema 4D", "3D Modeling", "Rendering"],
-                "Content Creation": ["Writing", "Copywriting", "Storytelling", "Photography", "Social Media Content"]
-            }
-        },
-        "Hardware & IoT": {
-            "domains": {
-                "IoT Development": ["Arduino", "Raspberry Pi", "Sensors", "Embedded Systems", "C/C++", "Python"],
-                "Robotics": ["ROS", "Computer Vision", "Machine Learning", "Control Systems", "Sensors"],
-                "Electronics": ["Circuit Design", "PCB Design", "Microcontrollers", "Signal Processing"]
-            }
-        }
-    }
-    save_json(CATEGORIES_FILE, sample_categories)
-    return sample_categories
-
-def create_sample_users():
-    """Create sample users for demonstration"""
-    sample_users = [
-        {
-            "name": "Alex Chen",
-            "skills": ["Python", "Machine Learning", "TensorFlow", "Data Science", "API Development"],
-            "domain": ["AI/ML", "Web Development"],
-            "experience_level": "Advanced",
-            "availability": ["Evenings", "Weekends", "Flexible"],
-            "bio": "AI enthusiast with 4+ years of experience building ML models and web applications.",
-            "hackathon_experience": "6-10 Hackathons",
-            "preferred_team_size": 4,
-            "leadership_interest": "Can Lead if Needed",
-            "project_interest": ["AI/ML", "Web Apps", "Social Impact"],
-            "quick_team_opt_in": True,
-            "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        },
-        {
-            "name": "Maya Patel",
-            "skills": ["React", "JavaScript", "UI/UX", "Figma", "HTML", "CSS", "Node.js"],
-            "domain": ["Web Development", "UI/UX Design"],
-            "experience_level": "Intermediate",
-            "availability": ["Right Now", "Flexible", "Remote Only"],
-            "bio": "Full-stack developer with a passion for creating beautiful interfaces.",
-            "hackathon_experience": "3-5 Hackathons",
-            "preferred_team_size": 3,
-            "leadership_interest": "Prefer to Follow",
-            "project_interest": ["Web Apps", "Mobile Apps", "Social Impact"],
-            "quick_team_opt_in": True,
-            "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        },
-        {
-            "name": "Jordan Kim",
-            "skills": ["Blockchain", "Solidity", "Web3", "Smart Contracts", "JavaScript", "DeFi"],
-            "domain": ["Blockchain"],
-            "experience_level": "Expert",
-            "availability": ["Weekends", "Evenings"],
-            "bio": "Blockchain architect with deep expertise in DeFi protocols.",
-            "hackathon_experience": "Veteran (10+)",
-            "preferred_team_size": 4,
-            "leadership_interest": "Love to Lead",
-            "project_interest": ["Blockchain", "Fintech"],
-            "quick_team_opt_in": True,
-            "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        },
-        {
-            "name": "Sam Rodriguez",
-            "skills": ["Product Management", "User Research", "Analytics", "Strategy", "Agile", "Scrum"],
-            "domain": ["Product Management"],
-            "experience_level": "Advanced",
-            "availability": ["Flexible", "Full-time"],
-            "bio": "Product manager with 5+ years experience launching successful tech products.",
-            "hackathon_experience": "3-5 Hackathons",
-            "preferred_team_size": 5,
-            "leadership_interest": "Natural Leader",
-            "project_interest": ["Web Apps", "Mobile Apps", "Fintech", "Social Impact"],
-            "quick_team_opt_in": True,
-            "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        },
-        {
-            "name": "Riley Johnson",
-            "skills": ["Unity", "C#", "Game Development", "3D Modeling", "Blender", "Animation"],
-            "domain": ["Game Development"],
-            "experience_level": "Intermediate",
-            "availability": ["Weekends", "Evenings"],
-            "bio": "Indie game developer passionate about creating immersive experiences.",
-            "hackathon_experience": "1-2 Hackathons",
-            "preferred_team_size": 3,
-            "leadership_interest": "Can Lead if Needed",
-            "project_interest": ["Games", "Mobile Apps"],
-            "quick_team_opt_in": True,
-            "created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-    ]
-    
-    # Save sample users
-    users_data = {user["name"]: user for user in sample_users}
-    save_json(USERS_FILE, users_data)
-    return sample_users
-
-def initialize_sample_data():
-    """Initialize sample data if no data exists"""
-    if not os.path.exists(USERS_FILE) or not get_all_users():
-        create_sample_users()
-    
-    if not os.path.exists(CATEGORIES_FILE) or not load_json(CATEGORIES_FILE):
-        create_sample_categories()
-
 if __name__ == "__main__":
     # Initialize sample data
     initialize_sample_data()
@@ -0,0 +1,56 @@
+"""Measure the cold import time of the UI-free matching engine.
+
+Usage:
+    python benchmarks/bench_engine_import.py [--runs 10] [--limit 0.2]
+
+Imports hackmate_engine in a fresh interpreter --runs times and reports the
+time the import statement took. It also checks that the import pulled in
+neither Streamlit nor the plotting libraries. Exits non-zero if the median
+is over --limit seconds or a UI library was loaded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UI_MODULES = ['streamlit', 'plotly', 'PIL', 'pandas', 'sklearn']
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import hackmate_engine
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {UI_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import():
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--limit', type=float, default=0.2, help="median budget in seconds")
+    args = parser.parse_args()
+
+    cold_import()  # the first run also writes the bytecode cache
+    probes = [cold_import() for _ in range(args.runs)]
+    timings = sorted(probe['seconds'] for probe in probes)
+    loaded = sorted({module for probe in probes for module in probe['loaded']})
+    median = statistics.median(timings)
+    print(f"hackmate_engine cold import: median {median * 1000:.1f} ms, "
+          f"min {timings[0] * 1000:.1f} ms, max {timings[-1] * 1000:.1f} ms "
+          f"({'ok' if median <= args.limit else 'OVER'} {args.limit * 1000:.0f} ms limit)")
+    if loaded:
+        print("UI libraries imported by the engine: " + ", ".join(loaded))
+    sys.exit(0 if median <= args.limit and not loaded else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Measure recall@k and latency of the ANN skill index against exact matching.
+
+Usage:
+    python benchmarks/bench_skill_index.py [--size 200000] [--queries 200] [--k 5]
+                                           [--tables 16] [--bits N] [--probes 0 1 2 4]
+
+Builds a synthetic population with a long-tailed skill vocabulary, saves a
+SkillLSHIndex to a temporary directory and memory-maps it back, then ranks
+the same query profiles with and without the index. A result counts towards
+recall@k when its similarity is at least the k-th exact similarity, so ties
+at the cut-off are not penalised.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hackmate_engine as engine
+
+
+def synthetic_population(count, vocabulary=3000, seed=0):
+    """Profiles whose skills follow a Zipf-like popularity curve"""
+    rng = random.Random(seed)
+    skills = [f"skill {i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    users = {}
+    for i in range(count):
+        users[f"hacker_{i}"] = {
+            "name": f"Hacker {i}",
+            "skills": list(dict.fromkeys(rng.choices(skills, weights, k=rng.randint(2, 8)))),
+            "availability": rng.sample(engine.AVAILABILITY_OPTIONS, rng.randint(1, 3)),
+            "experience_level": rng.choice(list(engine.EXPERIENCE_LEVELS)),
+        }
+    return users
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--tables', type=int, default=16)
+    parser.add_argument('--bits', type=int, default=None, help="bits per key; sized to the population by default")
+    parser.add_argument('--probes', type=int, nargs='+', default=[0, 1, 2, 4])
+    args = parser.parse_args()
+
+    users = synthetic_population(args.size, seed=args.size)
+    start = time.perf_counter()
+    index = engine.SkillLSHIndex.build(users, args.tables, args.bits)
+    build_s = time.perf_counter() - start
+
+    index_dir = tempfile.mkdtemp(prefix='hackmate-index-')
+    try:
+        index.save(index_dir)
+        start = time.perf_counter()
+        index = engine.SkillLSHIndex.load(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        matrix = engine.ProfileMatrix(list(users.values()), list(users.keys()))
+        start = time.perf_counter()
+        matrix.attach_index(index)
+        attach_s = time.perf_counter() - start
+        print(f"{args.size} profiles: build {build_s:.1f} s, mmap load {load_ms:.1f} ms, "
+              f"attach {attach_s:.2f} s, {index.tables} tables x {index.bits} bits")
+
+        queries = random.Random(1).sample(list(users.values()), args.queries)
+        exact, exact_ms = timed(
+            lambda user: engine.rank_similar_profiles(matrix, user, args.k, use_index=False), queries)
+        print(f"  exact            {exact_ms:7.2f} ms/query")
+
+        for probes in args.probes:
+            shortlist = np.mean([len(matrix.shortlist(user['skills'], probes)) for user in queries])
+            approx, approx_ms = timed(
+                lambda user: engine.rank_similar_profiles(matrix, user, args.k, probes=probes), queries)
+            hits = total = 0
+            for want, got in zip(exact, approx):
+                if want:
+                    cutoff = want[-1][1]
+                    hits += sum(1 for _, score in got if score >= cutoff - 1e-12)
+                    total += len(want)
+            print(f"  probes={probes:<2}      {approx_ms:7.2f} ms/query, recall@{args.k} {hits / total:.3f}, "
+                  f"{exact_ms / approx_ms:5.1f}x faster, shortlist {shortlist:,.0f} rows")
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
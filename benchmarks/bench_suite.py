@@ -0,0 +1,202 @@
+"""Benchmark the matching, scoring and persistence hot paths headlessly.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000] [--budget 5] [--seed 0]
+                                     [--output results.json] [--compare baseline.json]
+
+For each population size, a child process builds synthetic users from the
+app's sample profiles in a temporary data directory. It then times every
+benchmarked function until --budget seconds or --calls calls run out, and
+measures peak traced memory over one extra call. Results are printed and
+written as JSON (to the system temp directory unless --output is given)
+together with the commit they were taken at, so two runs can be compared
+with --compare.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import hackmate_engine as engine
+
+FUNCTIONS = ['find_best_matches', 'create_instant_team_match', 'calculate_domain_scores',
+             'calculate_team_compatibility', 'generate_team_roles', 'json_round_trip']
+
+
+def synthetic_population(count, seed=0):
+    """Users modelled on SAMPLE_USERS, with skills drawn from the sample category lists"""
+    rng = random.Random(seed)
+    category_skills = sorted({skill for category in engine.SAMPLE_CATEGORIES.values()
+                              for skills in category['domains'].values() for skill in skills})
+    users = {}
+    for i in range(count):
+        template = rng.choice(engine.SAMPLE_USERS)
+        skills = rng.sample(template['skills'], rng.randint(1, len(template['skills'])))
+        skills += rng.sample(category_skills, rng.randint(0, 4))
+        user = {
+            **template,
+            'name': f"{template['name']} {i}",
+            'skills': list(dict.fromkeys(skills)),
+            'experience_level': rng.choice(list(engine.EXPERIENCE_LEVELS)),
+            'availability': rng.sample(engine.AVAILABILITY_OPTIONS, rng.randint(1, 3)),
+            'preferred_team_size': rng.randint(2, 5),
+        }
+        users[user['name']] = user
+    return users
+
+
+def time_calls(fn, args_for, budget, max_calls):
+    """Per-call latencies of fn(*args_for(i)), after one warm-up call"""
+    fn(*args_for(0))
+    timings = []
+    deadline = time.perf_counter() + budget
+    for i in range(1, max_calls + 1):
+        args = args_for(i)
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+        if len(timings) >= 3 and time.perf_counter() > deadline:
+            break
+    return timings
+
+
+def peak_memory(fn, args):
+    """Peak traced allocation, in KiB, of one call"""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_population(size, seed, budget, max_calls):
+    """Benchmark every function against one population; runs in its own process"""
+    data_dir = tempfile.mkdtemp(prefix='hackmate-bench-')
+    os.chdir(data_dir)
+    try:
+        start = time.perf_counter()
+        users = synthetic_population(size, seed)
+        storage = engine.get_storage()
+        storage.put_many('users', users)
+        engine.encode_saved_profiles(storage)
+        categories = engine.create_sample_categories()
+        engine.get_profile_matrix()
+        engine.get_domain_score_matrix(categories)
+        setup = time.perf_counter() - start
+
+        profiles = list(storage.all('users').values())
+        rng = random.Random(seed)
+        queries = [rng.choice(profiles) for _ in range(max_calls + 1)]
+        teams = [rng.sample(profiles, 4) for _ in range(max_calls + 1)]
+        payload_path = os.path.join(data_dir, 'round_trip.json')
+
+        def json_round_trip(data):
+            engine.save_json(payload_path, data)
+            # Move the mtime on so load_json parses the file instead of returning the cached copy
+            stat = os.stat(payload_path)
+            os.utime(payload_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            return engine.load_json(payload_path)
+
+        benchmarks = {
+            'find_best_matches': (engine.find_best_matches, lambda i: (queries[i],)),
+            'create_instant_team_match': (engine.create_instant_team_match, lambda i: (queries[i],)),
+            'calculate_domain_scores': (engine.calculate_domain_scores, lambda i: (queries[i], categories)),
+            'calculate_team_compatibility': (engine.calculate_team_compatibility, lambda i: (teams[i],)),
+            'generate_team_roles': (engine.generate_team_roles, lambda i: (teams[i], "AI/ML")),
+            'json_round_trip': (json_round_trip, lambda i: (users,)),
+        }
+        results = []
+        for name in FUNCTIONS:
+            fn, args_for = benchmarks[name]
+            timings = sorted(time_calls(fn, args_for, budget, max_calls))
+            results.append({
+                'function': name,
+                'users': size,
+                'calls': len(timings),
+                'p50_ms': percentile(timings, 0.50) * 1000,
+                'p95_ms': percentile(timings, 0.95) * 1000,
+                'mean_ms': sum(timings) / len(timings) * 1000,
+                'throughput_per_s': len(timings) / sum(timings),
+                'peak_kib': peak_memory(fn, args_for(0)),
+            })
+        return {'users': size, 'setup_s': setup, 'results': results}
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(report, baseline=None):
+    previous = {}
+    for row in (baseline or {}).get('results', []):
+        previous[row['function'], row['users']] = row
+    header = f"{'function':<30}{'users':>8}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>10}{'peak KiB':>11}"
+    print(header + ("  p50 vs baseline" if baseline else ""))
+    for row in report['results']:
+        line = (f"{row['function']:<30}{row['users']:>8}{row['calls']:>7}{row['p50_ms']:>10.3f}"
+                f"{row['p95_ms']:>10.3f}{row['throughput_per_s']:>10.1f}{row['peak_kib']:>11.0f}")
+        old = previous.get((row['function'], row['users']))
+        if old:
+            line += f"  {row['p50_ms'] / old['p50_ms']:.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--budget', type=float, default=5.0, help="seconds to spend timing each function")
+    parser.add_argument('--calls', type=int, default=200, help="most calls to time per function")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(tempfile.gettempdir(), 'hackmate_bench_results.json'),
+                        help="results file (default: in the system temp directory)")
+    parser.add_argument('--compare', help="earlier results file to compare p50 latencies with")
+    args = parser.parse_args()
+
+    report = {'commit': current_commit(), 'python': platform.python_version(),
+              'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'setup_s': {}, 'results': []}
+    # A fresh process per population keeps caches and peak memory from leaking between sizes
+    context = multiprocessing.get_context('spawn')
+    for size in args.sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            population = pool.submit(run_population, size, args.seed, args.budget, args.calls).result()
+        report['setup_s'][str(size)] = population['setup_s']
+        report['results'].extend(population['results'])
+        print(f"{size} users set up in {population['setup_s']:.1f} s")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparing with {args.compare} (commit {baseline.get('commit')})")
+    print_results(report, baseline)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
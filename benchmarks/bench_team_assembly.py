@@ -0,0 +1,70 @@
+"""Compare beam-search team assembly with pairwise ranking: compatibility against latency.
+
+Usage:
+    python benchmarks/bench_team_assembly.py [--users 10000] [--sizes 2 3 4 5 6]
+                                             [--widths 1 2 4 8 16] [--requesters 20]
+
+Builds a synthetic user pool and, for each team size, assembles teams around
+the same requesters. The pairwise baseline adds the requester's best
+complementary matches, as Quick Teams used to. The beam rows run
+assemble_team at each width with no time budget. It reports mean team
+compatibility, how often the team came back at the requested size, and the
+p50/p95 latency.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hackmate_engine as engine
+from bench_suite import synthetic_population
+
+
+def pairwise_team(matrix, user, size):
+    matches = engine.rank_complementary_matches(matrix, user, top_k=size - 1)
+    members = [user] + [profile for profile, _ in matches]
+    return members, engine.calculate_team_compatibility(members)
+
+
+def measure(assemble, requesters, size):
+    compatibilities, timings, full = [], [], 0
+    for user in requesters:
+        start = time.perf_counter()
+        members, compatibility = assemble(user, size)
+        timings.append(time.perf_counter() - start)
+        compatibilities.append(compatibility)
+        full += len(members) == size
+    timings.sort()
+    return (statistics.mean(compatibilities), full / len(requesters),
+            timings[len(timings) // 2], timings[min(len(timings) - 1, int(0.95 * len(timings)))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 3, 4, 5, 6])
+    parser.add_argument('--widths', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--requesters', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    users = synthetic_population(args.users, args.seed)
+    matrix = engine.ProfileMatrix(list(users.values()), list(users.keys()))
+    requesters = random.Random(args.seed).sample(list(users.values()), args.requesters)
+    print(f"{args.users} users, {args.requesters} requesters per row")
+    print(f"{'size':>4}  {'method':<10}{'compat %':>10}{'full size':>11}{'p50 ms':>10}{'p95 ms':>10}")
+    for size in args.sizes:
+        methods = [('pairwise', lambda user, size: pairwise_team(matrix, user, size))]
+        methods += [(f"beam {width}", lambda user, size, width=width: engine.assemble_team(
+            user, size, beam_width=width, time_budget=float('inf'), matrix=matrix)) for width in args.widths]
+        for name, assemble in methods:
+            compatibility, full, p50, p95 = measure(assemble, requesters, size)
+            print(f"{size:>4}  {name:<10}{compatibility:>10.2f}{full:>11.0%}{p50 * 1000:>10.2f}{p95 * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
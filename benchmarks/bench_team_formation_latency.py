@@ -0,0 +1,79 @@
+"""Measure end-to-end Quick Teams formation latency through the Streamlit page.
+
+Usage:
+    python benchmarks/bench_team_formation_latency.py [--sizes 1000 10000] [--runs 10] [--limit 1.0]
+
+Runs app4.py headless with Streamlit's AppTest against a temporary data
+directory of synthetic users, submits the "FIND MY TEAM NOW!" form and times
+the whole script run: matching, role assignment, saving the team and
+rendering it. The sidebar promises a team in under 60 seconds; this exits
+non-zero if the 95th percentile is over --limit seconds.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from bench_instant_match import synthetic_users
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# streamlit run puts the script's directory on sys.path for app4's engine import; AppTest does not
+sys.path.insert(0, ROOT)
+
+
+def time_formations(size, runs):
+    data_dir = tempfile.mkdtemp(prefix='hackmate-bench-')
+    cwd = os.getcwd()
+    try:
+        users = synthetic_users(size, seed=size)
+        with open(os.path.join(data_dir, 'users.json'), 'w', encoding='utf-8') as f:
+            json.dump({user['name']: user for user in users}, f)
+        shutil.copy(os.path.join(ROOT, 'categories.json'), data_dir)
+        os.chdir(data_dir)
+
+        app = AppTest.from_file(os.path.join(ROOT, 'app4.py'), default_timeout=600).run()
+        page = next(option for option in app.sidebar.radio[0].options if 'Quick Teams' in option)
+        app.sidebar.radio[0].set_value(page).run()
+
+        timings = []
+        for run in range(runs + 1):
+            app.selectbox[0].set_value(users[run * 7919 % size]['name'])
+            start = time.perf_counter()
+            app.button[0].click().run()
+            elapsed = time.perf_counter() - start
+            if app.exception:
+                raise RuntimeError(app.exception[0].message)
+            if run:  # the first submit also warms the shared caches
+                timings.append(elapsed)
+        return timings
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--limit', type=float, default=1.0, help="p95 budget in seconds")
+    args = parser.parse_args()
+
+    within_limit = True
+    for size in args.sizes:
+        timings = sorted(time_formations(size, args.runs))
+        p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+        within_limit &= p95 <= args.limit
+        print(f"{size:>8} users: median {statistics.median(timings) * 1000:7.1f} ms, "
+              f"p95 {p95 * 1000:7.1f} ms, max {timings[-1] * 1000:7.1f} ms "
+              f"({'ok' if p95 <= args.limit else 'OVER'} {args.limit:.1f} s limit)")
+    sys.exit(0 if within_limit else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Check that migrating the shipped team files resolves every member to a saved user.
+
+Usage:
+    python benchmarks/check_team_migration.py [--storage json sqlite]
+
+Copies the repository's JSON data files into a temporary directory, opens
+the storage there (which runs the team member migration) and checks that
+no team kept an archived copy of a member: every member of the shipped
+teams has a profile in users.json. Exits non-zero if any team did.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys
+import hackmate_engine as engine
+storage = engine.get_storage()
+archived = {f"{collection}/{team_id}": sorted(team['archived_members'])
+            for collection in engine.TEAM_COLLECTIONS
+            for team_id, team in storage.all(collection).items() if team.get('archived_members')}
+print(json.dumps({'teams': sum(storage.count(c) for c in engine.TEAM_COLLECTIONS), 'archived': archived}))
+"""
+
+
+def migrate(backend):
+    data_dir = tempfile.mkdtemp(prefix='hackmate-check-')
+    try:
+        for path in glob.glob(os.path.join(ROOT, '*.json')):
+            shutil.copy(path, data_dir)
+        env = {**os.environ, 'HACKMATE_STORAGE': backend,
+               'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')]))}
+        result = subprocess.run([sys.executable, '-c', PROBE], cwd=data_dir, env=env,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.splitlines()[-1]
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--storage', nargs='+', default=['json', 'sqlite'], choices=['json', 'sqlite'])
+    args = parser.parse_args()
+
+    ok = True
+    for backend in args.storage:
+        report = json.loads(migrate(backend))
+        print(f"{backend}: {report['teams']} teams, {len(report['archived'])} with archived members")
+        for team, members in report['archived'].items():
+            print(f"  {team}: {', '.join(members)}")
+        ok &= not report['archived']
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Build the approximate nearest-neighbour skill index used by find_best_matches.
+
+Usage:
+    python build_skill_index.py [--tables 16] [--bits N] [--output skill_index]
+
+Indexes every profile in the users collection and saves the index where the
+app memory-maps it on its next match. Profiles saved after the build are
+still matched exactly, so rebuild periodically rather than after every
+change. The index is only consulted once there are HACKMATE_INDEX_MIN_PROFILES
+users; HACKMATE_INDEX_PROBES trades latency for recall at query time.
+"""
+import argparse
+import time
+
+import hackmate_engine as engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=16, help="hash tables; more raise recall")
+    parser.add_argument('--bits', type=int, default=None, help="bits per key; sized to the population by default")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=engine.SKILL_INDEX_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    users = engine.get_storage().all('users')
+    if not users:
+        print("No users to index")
+        return
+    index = engine.SkillLSHIndex.build(users, args.tables, args.bits, args.seed)
+    index.save(args.output)
+    print(f"Indexed {index.count} profiles in {args.output} ({index.tables} tables x {index.bits} bits) "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
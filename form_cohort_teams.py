@@ -0,0 +1,34 @@
+"""Form teams for a whole event cohort in one batch.
+
+Usage:
+    python form_cohort_teams.py [--time-budget 10] [--seed 0] [--dry-run]
+
+Splits every user opted in to quick team matching into teams of their
+preferred size, maximising total team compatibility, and saves each team
+as a quick team unless --dry-run is given.
+"""
+import argparse
+
+import hackmate_engine as engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--time-budget', type=float, default=10.0, help="seconds to spend improving the teams")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help="print the teams without saving them")
+    args = parser.parse_args()
+
+    teams = engine.form_cohort_teams(time_budget=args.time_budget, seed=args.seed, save=not args.dry_run)
+    for members, compatibility in teams:
+        print(f"{compatibility:5.1f}%  " + ", ".join(member['name'] for member in members))
+    if teams:
+        total = sum(compatibility for _, compatibility in teams)
+        print(f"{len(teams)} teams, {sum(len(members) for members, _ in teams)} users, "
+              f"mean compatibility {total / len(teams):.1f}%")
+    else:
+        print("No users have opted in to quick team matching")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3102 @@
+"""HackMate core engine: storage, matching, scoring and team formation.
+
+Nothing here imports Streamlit, so workers, scripts and benchmarks can use it
+without the app's import cost or side effects. app4.py is the Streamlit UI
+on top of it. Shared state that the app used to keep in st.cache_resource
+lives in process-wide @shared_resource singletons. Errors that the app would
+show with st.error go through report_error, which logs them unless
+set_error_reporter installs something else.
+"""
+import atexit
+import json
+import os
+import numpy as np
+import re
+from datetime import datetime, timedelta
+import random
+import bisect
+import functools
+import heapq
+import copy
+import difflib
+import logging
+import sqlite3
+import hashlib
+import math
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger('hackmate')
+
+def shared_resource(factory):
+    """Decorator: build factory() once per process and return that object on every call.
+
+    The engine's stand-in for st.cache_resource. Streamlit keeps imported
+    modules between reruns, so the object is shared by all sessions.
+    """
+    instance = []
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+    return get
+
+_error_reporter = logger.error
+
+def set_error_reporter(reporter):
+    """Send recoverable errors to reporter(message) instead of the log (the app passes st.error)"""
+    global _error_reporter
+    _error_reporter = reporter
+
+def report_error(message):
+    """Report an error the caller recovers from, such as an unreadable data file"""
+    _error_reporter(message)
+
+# Metrics are off unless HACKMATE_METRICS_FILE names a file to dump them to, in the Prometheus text
+# format (for node_exporter's textfile collector, say), every HACKMATE_METRICS_INTERVAL seconds
+METRICS_FILE = os.environ.get('HACKMATE_METRICS_FILE')
+METRICS_INTERVAL = float(os.environ.get('HACKMATE_METRICS_INTERVAL', 15))
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class Metrics:
+    """Latency histograms and counters, rendered in the Prometheus text exposition format.
+
+    Histograms are keyed by function (or block) name and give call counts
+    as their _count; counters are keyed by name and labels.
+    """
+
+    COUNTERS = {
+        'hackmate_file_reads_total': "Data files read, or SQLite queries returning records, by format",
+        'hackmate_file_writes_total': "Data files written or appended to, or SQLite writes, by format",
+        'hackmate_bytes_parsed_total': "Bytes of data files or SQLite records parsed, by format",
+        'hackmate_bytes_written_total': "Bytes written to data files or SQLite records, by format",
+    }
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}  # name -> [per-bucket counts with +Inf last, sum of seconds]
+        self._counters = {}  # (name, sorted label pairs) -> value
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [[0] * (len(self.buckets) + 1), 0.0]
+            histogram[0][bucket] += 1
+            histogram[1] += seconds
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def render(self):
+        """All metrics as Prometheus exposition text"""
+        with self._lock:
+            histograms = {name: (list(counts), total) for name, (counts, total) in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = ["# HELP hackmate_function_duration_seconds Latency of instrumented functions and blocks",
+                 "# TYPE hackmate_function_duration_seconds histogram"]
+        for name in sorted(histograms):
+            counts, total = histograms[name]
+            cumulative = 0
+            for bound, count in zip([*map(repr, self.buckets), '+Inf'], counts):
+                cumulative += count
+                lines.append(f'hackmate_function_duration_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'hackmate_function_duration_seconds_sum{{function="{name}"}} {total!r}')
+            lines.append(f'hackmate_function_duration_seconds_count{{function="{name}"}} {cumulative}')
+        for counter, help_text in self.COUNTERS.items():
+            lines += [f"# HELP {counter} {help_text}", f"# TYPE {counter} counter"]
+            for (name, labels), value in sorted(counters.items()):
+                if name == counter:
+                    label_text = ','.join(f'{key}="{label}"' for key, label in labels)
+                    lines.append(f"{name}{{{label_text}}} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Atomically replace path with render()"""
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+# The process-wide registry, or None when metrics are off
+METRICS = Metrics() if METRICS_FILE else None
+
+def timed(fn):
+    """Decorator: record fn's latency under its qualified name; returns fn itself when metrics are off"""
+    if METRICS is None:
+        return fn
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            METRICS.observe(name, time.perf_counter() - start)
+    return wrapper
+
+@contextmanager
+def _timed_block(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(name, time.perf_counter() - start)
+
+def timer(name):
+    """Context manager recording the latency of its block under name when metrics are on"""
+    return nullcontext() if METRICS is None else _timed_block(name)
+
+def _dump_metrics():
+    try:
+        METRICS.dump(METRICS_FILE)
+    except OSError as e:
+        logger.warning("Could not write metrics to %s: %s", METRICS_FILE, e)
+
+@shared_resource
+def start_metrics_dump():
+    """Dump the metrics to METRICS_FILE every METRICS_INTERVAL seconds and at exit.
+
+    Safe to call on every run; the dump thread starts once per process.
+    Returns it, or None when metrics are off.
+    """
+    if METRICS is None:
+        return None
+
+    def run():
+        while True:
+            time.sleep(METRICS_INTERVAL)
+            _dump_metrics()
+
+    thread = threading.Thread(target=run, name='hackmate-metrics', daemon=True)
+    thread.start()
+    atexit.register(_dump_metrics)
+    return thread
+
+# File paths
+CATEGORIES_FILE = 'categories.json'
+USERS_FILE = 'users.json'
+TEAMS_FILE = 'teams.json'
+QUICK_TEAMS_FILE = 'quick_teams.json'
+HACKATHONS_FILE = 'hackathons.json'
+TEAM_REQUESTS_FILE = 'team_requests.json'
+TEAM_REQUESTS_LOG = 'team_requests.jsonl'
+DATABASE_FILE = 'hackmate.db'
+SKILL_INDEX_DIR = 'skill_index'
+
+# Storage backend: "json" (one file per collection) or "sqlite" (DATABASE_FILE)
+STORAGE_BACKEND = os.environ.get('HACKMATE_STORAGE', 'json').lower()
+
+# Collections served by the storage backend and the JSON files they live in
+COLLECTION_FILES = {
+    'users': USERS_FILE,
+    'teams': TEAMS_FILE,
+    'quick_teams': QUICK_TEAMS_FILE,
+    'team_requests': TEAM_REQUESTS_FILE,
+}
+
+# Collections holding teams; their members are stored as user ids
+TEAM_COLLECTIONS = ('teams', 'quick_teams')
+
+# The ANN skill index is only consulted for populations where exact scoring gets slow;
+# each extra probe per table raises recall at some cost in latency
+SKILL_INDEX_MIN_PROFILES = int(os.environ.get('HACKMATE_INDEX_MIN_PROFILES', 50000))
+SKILL_INDEX_PROBES = int(os.environ.get('HACKMATE_INDEX_PROBES', 2))
+
+# Quick team assembly: teams kept per step of the beam search, and seconds before it narrows to greedy
+TEAM_BEAM_WIDTH = int(os.environ.get('HACKMATE_BEAM_WIDTH', 4))
+TEAM_ASSEMBLY_BUDGET = float(os.environ.get('HACKMATE_ASSEMBLY_BUDGET', 0.5))
+
+# Experience levels as ordinals for scoring; unknown levels count as Intermediate
+EXPERIENCE_LEVELS = {"Beginner": 1, "Intermediate": 2, "Advanced": 3, "Expert": 4}
+
+# Availability choices on the profile form; option i is bit i of a profile's availability_mask
+AVAILABILITY_OPTIONS = ["Right Now", "Weekends", "Evenings", "Flexible",
+                        "Full-time", "Part-time", "Remote Only"]
+AVAILABILITY_BITS = {option: bit for bit, option in enumerate(AVAILABILITY_OPTIONS)}
+
+# Category skill lists written to categories.json on first run; also the base of skill canonicalization
+SAMPLE_CATEGORIES = {
+    "Technology": {
+        "domains": {
+            "Web Development": ["HTML", "CSS", "JavaScript", "React", "Vue.js", "Node.js", "Python", "Django", "Flask"],
+            "Mobile Development": ["Flutter", "React Native", "Swift", "Kotlin", "Android", "iOS", "Xamarin"],
+            "AI/ML": ["Python", "TensorFlow", "PyTorch", "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Data Science"],
+            "Blockchain": ["Solidity", "Web3", "DeFi", "Smart Contracts", "Ethereum", "Bitcoin", "Cryptocurrency"],
+            "Game Development": ["Unity", "Unreal Engine", "C#", "C++", "GameMaker", "Godot", "Blender"],
+            "Data Science": ["Python", "R", "SQL", "Pandas", "NumPy", "Matplotlib", "Jupyter", "Statistics"],
+            "DevOps": ["Docker", "Kubernetes", "AWS", "Azure", "CI/CD", "Jenkins", "Git", "Linux"],
+            "Cybersecurity": ["Penetration Testing", "Network Security", "Cryptography", "Ethical Hacking", "OWASP"]
+        }
+    },
+    "Business & Strategy": {
+        "domains": {
+            "Product Management": ["Product Strategy", "User Research", "Agile", "Scrum", "Analytics", "Roadmapping"],
+            "Marketing": ["Digital Marketing", "SEO", "Content Marketing", "Social Media", "Email Marketing", "PPC"],
+            "Finance": ["Financial Analysis", "Accounting", "Investment", "Risk Management", "Budgeting", "FinTech"],
+            "Sales": ["Lead Generation", "CRM", "Sales Strategy", "Negotiation", "Customer Relations"],
+            "Strategy": ["Business Planning", "Market Research", "Consulting", "Competitive Analysis"]
+        }
+    },
+    "Design & Creative": {
+        "domains": {
+            "UI/UX Design": ["Figma", "Adobe XD", "Sketch", "Prototyping", "User Research", "Wireframing"],
+            "Graphic Design": ["Adobe Photoshop", "Adobe Illustrator", "InDesign", "Canva", "Branding"],
+            "Video Production": ["Adobe Premiere", "After Effects", "Final Cut Pro", "Video Editing", "Animation"],
+            "3D Design": ["Blender", "Maya", "3ds Max", "Cinema 4D", "3D Modeling", "Rendering"],
+            "Content Creation": ["Writing", "Copywriting", "Storytelling", "Photography", "Social Media Content"]
+        }
+    },
+    "Hardware & IoT": {
+        "domains": {
+            "IoT Development": ["Arduino", "Raspberry Pi", "Sensors", "Embedded Systems", "C/C++", "Python"],
+            "Robotics": ["ROS", "Computer Vision", "Machine Learning", "Control Systems", "Sensors"],
+            "Electronics": ["Circuit Design", "PCB Design", "Microcontrollers", "Signal Processing"]
+        }
+    }
+}
+
+# Demo profiles saved on first run; also the templates for benchmark populations
+SAMPLE_USERS = [
+    {
+        "name": "Alex Chen",
+        "skills": ["Python", "Machine Learning", "TensorFlow", "Data Science", "API Development"],
+        "domain": ["AI/ML", "Web Development"],
+        "experience_level": "Advanced",
+        "availability": ["Evenings", "Weekends", "Flexible"],
+        "bio": "AI enthusiast with 4+ years of experience building ML models and web applications.",
+        "hackathon_experience": "6-10 Hackathons",
+        "preferred_team_size": 4,
+        "leadership_interest": "Can Lead if Needed",
+        "project_interest": ["AI/ML", "Web Apps", "Social Impact"],
+        "quick_team_opt_in": True
+    },
+    {
+        "name": "Maya Patel",
+        "skills": ["React", "JavaScript", "UI/UX", "Figma", "HTML", "CSS", "Node.js"],
+        "domain": ["Web Development", "UI/UX Design"],
+        "experience_level": "Intermediate",
+        "availability": ["Right Now", "Flexible", "Remote Only"],
+        "bio": "Full-stack developer with a passion for creating beautiful interfaces.",
+        "hackathon_experience": "3-5 Hackathons",
+        "preferred_team_size": 3,
+        "leadership_interest": "Prefer to Follow",
+        "project_interest": ["Web Apps", "Mobile Apps", "Social Impact"],
+        "quick_team_opt_in": True
+    },
+    {
+        "name": "Jordan Kim",
+        "skills": ["Blockchain", "Solidity", "Web3", "Smart Contracts", "JavaScript", "DeFi"],
+        "domain": ["Blockchain"],
+        "experience_level": "Expert",
+        "availability": ["Weekends", "Evenings"],
+        "bio": "Blockchain architect with deep expertise in DeFi protocols.",
+        "hackathon_experience": "Veteran (10+)",
+        "preferred_team_size": 4,
+        "leadership_interest": "Love to Lead",
+        "project_interest": ["Blockchain", "Fintech"],
+        "quick_team_opt_in": True
+    },
+    {
+        "name": "Sam Rodriguez",
+        "skills": ["Product Management", "User Research", "Analytics", "Strategy", "Agile", "Scrum"],
+        "domain": ["Product Management"],
+        "experience_level": "Advanced",
+        "availability": ["Flexible", "Full-time"],
+        "bio": "Product manager with 5+ years experience launching successful tech products.",
+        "hackathon_experience": "3-5 Hackathons",
+        "preferred_team_size": 5,
+        "leadership_interest": "Natural Leader",
+        "project_interest": ["Web Apps", "Mobile Apps", "Fintech", "Social Impact"],
+        "quick_team_opt_in": True
+    },
+    {
+        "name": "Riley Johnson",
+        "skills": ["Unity", "C#", "Game Development", "3D Modeling", "Blender", "Animation"],
+        "domain": ["Game Development"],
+        "experience_level": "Intermediate",
+        "availability": ["Weekends", "Evenings"],
+        "bio": "Indie game developer passionate about creating immersive experiences.",
+        "hackathon_experience": "1-2 Hackathons",
+        "preferred_team_size": 3,
+        "leadership_interest": "Can Lead if Needed",
+        "project_interest": ["Games", "Mobile Apps"],
+        "quick_team_opt_in": True
+    }
+]
+
+# Other spellings of common skills, by canonical name. Case, spacing, hyphens,
+# dots and slashes are ignored anyway (see skill_key), so only list real aliases.
+SKILL_SYNONYMS = {
+    "Machine Learning": ["ML"],
+    "Deep Learning": ["DL"],
+    "Artificial Intelligence": ["AI"],
+    "NLP": ["Natural Language Processing"],
+    "Data Analysis": ["Data Analytics"],
+    "Statistics": ["Stats"],
+    "scikit-learn": ["sklearn", "scikit"],
+    "TensorFlow": ["TF"],
+    "PyTorch": ["Torch"],
+    "Python": ["Python3", "Py"],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "Node.js": ["Node"],
+    "React": ["ReactJS"],
+    "Vue.js": ["Vue"],
+    "Angular": ["AngularJS"],
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "C++": ["CPP"],
+    "C#": ["CSharp", "C Sharp"],
+    "Go": ["Golang"],
+    "PostgreSQL": ["Postgres"],
+    "API Development": ["API", "APIs", "REST API", "REST APIs"],
+    "AWS": ["Amazon Web Services"],
+    "Google Cloud": ["GCP", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure"],
+    "Kubernetes": ["K8s"],
+    "CI/CD": ["Continuous Integration"],
+    "Cybersecurity": ["Cyber Security", "InfoSec", "Information Security", "Security"],
+    "Penetration Testing": ["Pentesting", "Pen Testing", "Pentest"],
+    "Ethereum": ["ETH"],
+    "Smart Contracts": ["Smart Contract"],
+    "Web3": ["Web 3.0"],
+    "IoT": ["Internet of Things"],
+    "Raspberry Pi": ["RPi", "Raspi"],
+    "Embedded Systems": ["Embedded"],
+    "VR/AR": ["AR/VR", "Virtual Reality", "Augmented Reality", "XR"],
+    "Game Development": ["Gamedev", "Game Dev"],
+    "Mobile Development": ["Mobile Dev", "App Development"],
+    "Web Development": ["Web Dev"],
+    "UI/UX Design": ["UI/UX", "UX/UI", "UX/UI Design", "UX Design", "UI Design"],
+    "3D Modeling": ["3D Modelling"],
+    "Adobe Photoshop": ["Photoshop"],
+    "Adobe Illustrator": ["Illustrator"],
+    "Adobe Premiere": ["Premiere Pro", "Adobe Premiere Pro"],
+    "After Effects": ["Adobe After Effects"],
+    "SEO": ["Search Engine Optimization"],
+    "CRM": ["Customer Relationship Management"],
+    "Communication": ["Communication Skills"],
+}
+
+# Bumped when the canonical skills or availability_mask saved with a profile would change;
+# older profiles are re-encoded on startup
+PROFILE_ENCODING = 2
+
+# Snap unknown skills of at least this many key characters to a known skill this similar (difflib ratio)
+SKILL_FUZZY_MIN_LENGTH = 5
+SKILL_FUZZY_CUTOFF = 0.9
+
+# Team roles and the skill keywords that qualify a member for each; a keyword counts when it
+# appears inside one of the member's skill keys, so "api" matches API Development
+TEAM_ROLES = {
+    'Team Lead': ['leadership', 'project management', 'communication'],
+    'Tech Lead': ['programming', 'software development', 'architecture'],
+    'Designer': ['ui/ux', 'design', 'figma', 'adobe', 'graphics'],
+    'Backend Dev': ['python', 'java', 'node.js', 'database', 'api'],
+    'Frontend Dev': ['react', 'javascript', 'html', 'css', 'vue'],
+    'Data Specialist': ['data science', 'machine learning', 'analytics', 'sql'],
+    'Business Analyst': ['business', 'strategy', 'marketing', 'finance'],
+}
+
+# Role score bonus by experience level; unknown levels get the Intermediate bonus
+ROLE_EXPERIENCE_BONUS = {'Expert': 3, 'Advanced': 2, 'Intermediate': 1, 'Beginner': 0.5}
+
+class JsonCache:
+    """Parsed JSON files shared by every session.
+
+    An entry is served while the file's (mtime, size) signature matches and
+    no save has bumped the file's version since the entry was stored.
+    """
+
+    def __init__(self):
+        self._entries = {}  # path -> (signature, version, data)
+        self._versions = {}  # path -> number of saves seen by this process
+        self._lock = threading.Lock()
+
+    def version(self, path):
+        with self._lock:
+            return self._versions.get(path, 0)
+
+    def lookup(self, path, signature):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == signature and entry[1] == self._versions.get(path, 0):
+                return entry[2]
+        return None
+
+    def store(self, path, signature, version, data):
+        """Cache data read from disk, unless a save happened while it was being read"""
+        with self._lock:
+            if self._versions.get(path, 0) == version:
+                self._entries[path] = (signature, version, data)
+
+    def replace(self, path, signature, data):
+        """Record data that was just written, bumping the file's version"""
+        with self._lock:
+            version = self._versions.get(path, 0) + 1
+            self._versions[path] = version
+            if signature is None:
+                self._entries.pop(path, None)
+            else:
+                self._entries[path] = (signature, version, data)
+
+@shared_resource
+def get_json_cache():
+    """Get the JSON cache shared by all sessions"""
+    return JsonCache()
+
+class FileLocks:
+    """Advisory locks on "<file>.lock", shared by every session in the process.
+
+    A lock is exclusive across threads and processes and re-entrant within
+    the thread that holds it, so a transaction can call save_json freely.
+    """
+
+    def __init__(self):
+        self._locks = {}  # path -> (RLock, [hold depth, lock file])
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, path):
+        with self._guard:
+            thread_lock, state = self._locks.setdefault(path, (threading.RLock(), [0, None]))
+        with thread_lock:
+            if state[0] == 0:
+                lock_file = open(path + '.lock', 'a+b')
+                try:
+                    _lock_file(lock_file)
+                except BaseException:
+                    lock_file.close()
+                    raise
+                state[1] = lock_file
+            state[0] += 1
+            try:
+                yield
+            finally:
+                state[0] -= 1
+                if state[0] == 0:
+                    lock_file, state[1] = state[1], None
+                    _unlock_file(lock_file)
+                    lock_file.close()
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock_file(lock_file):
+        while True:
+            try:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+
+    def _unlock_file(lock_file):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+@shared_resource
+def get_file_locks():
+    """Get the file lock registry shared by all sessions"""
+    return FileLocks()
+
+def file_lock(file_path):
+    """Hold the advisory lock for a data file"""
+    return get_file_locks().hold(os.path.abspath(file_path))
+
+def _file_signature(file_path):
+    # Atomic writes replace the inode, so it changes on every save
+    stat = os.stat(file_path)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _read_json(path):
+    """Read a JSON file through the cache; raises on unreadable files"""
+    if not os.path.exists(path):
+        return {}
+    cache = get_json_cache()
+    signature = _file_signature(path)
+    data = cache.lookup(path, signature)
+    if data is None:
+        version = cache.version(path)
+        with open(path, 'rb') as f:
+            payload = f.read()
+        data = json.loads(payload)
+        if METRICS is not None:
+            METRICS.inc('hackmate_file_reads_total', format='json')
+            METRICS.inc('hackmate_bytes_parsed_total', len(payload), format='json')
+        cache.store(path, signature, version, data)
+    return data
+
+def _write_json_atomic_bytes(path, payload):
+    """Write to a temp file, fsync it and rename it over the target"""
+    directory, name = os.path.split(path)
+    # mkstemp creates 0600 files; keep the permissions the target already had
+    mode = os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if METRICS is not None:
+        METRICS.inc('hackmate_file_writes_total', format='json')
+        METRICS.inc('hackmate_bytes_written_total', len(payload), format='json')
+    if os.name != 'nt':
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def _write_json_atomic(path, data):
+    """Atomically replace a JSON file and refresh its cache entry"""
+    _write_json_atomic_bytes(path, json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8'))
+    get_json_cache().replace(path, _file_signature(path), data)
+
+@timed
+def load_json(file_path):
+    """Load JSON data from file with error handling.
+
+    Results are cached across sessions, so treat them as read-only and
+    write changes back with save_json or json_transaction.
+    """
+    try:
+        return _read_json(os.path.abspath(file_path))
+    except Exception as e:
+        report_error(f"Error loading {file_path}: {str(e)}")
+        return {}
+
+@timed
+def save_json(file_path, data):
+    """Save JSON data to file with error handling"""
+    path = os.path.abspath(file_path)
+    try:
+        with file_lock(path):
+            _write_json_atomic(path, data)
+    except Exception as e:
+        get_json_cache().replace(path, None, None)
+        report_error(f"Error saving {file_path}: {str(e)}")
+
+@contextmanager
+def json_transaction(file_path):
+    """Read-modify-write a JSON file under its lock.
+
+    Yields a shallow copy of the current contents; replace top-level
+    entries rather than editing nested values in place. The file is
+    written back atomically if it changed and the block exits without an
+    error.
+    Unreadable files raise instead of being overwritten.
+    """
+    path = os.path.abspath(file_path)
+    with file_lock(path):
+        current = _read_json(path)
+        data = dict(current)
+        yield data
+        if data != current:
+            _write_json_atomic(path, data)
+
+# Storage backends
+class RequestJournal:
+    """Team requests kept as a JSON snapshot plus an append-only JSONL log.
+
+    Creating a request or changing its status appends one event line
+    instead of rewriting every request. Readers replay lines they have not
+    seen yet into an in-memory view indexed by user, and once the log holds
+    COMPACT_EVERY events it is folded into the snapshot and emptied.
+    """
+
+    COMPACT_EVERY = 500
+
+    def __init__(self, snapshot_path, log_path):
+        self.snapshot_path = os.path.abspath(snapshot_path)
+        self.log_path = os.path.abspath(log_path)
+        self._lock = threading.RLock()
+        self._position = None  # (snapshot signature, log inode, bytes replayed)
+        self._events = 0
+        self._requests = {}
+        self._by_user = {}  # username -> ids of requests to or from them, in order
+
+    def _index(self, request_id, request):
+        for username in (request.get('to_user'), request.get('from_user')):
+            self._by_user.setdefault(username, {})[request_id] = None
+
+    def _apply(self, event):
+        request_id = event['id']
+        if event['op'] == 'create':
+            request = event['request']
+        elif request_id in self._requests:
+            # Build a new dict: readers may still hold the old one
+            request = {**self._requests[request_id], **event['updates']}
+            old = self._requests[request_id]
+            for username in (old.get('to_user'), old.get('from_user')):
+                self._by_user.get(username, {}).pop(request_id, None)
+        else:
+            return
+        self._requests[request_id] = request
+        self._index(request_id, request)
+
+    def _refresh(self):
+        """Bring the view up to date with the files on disk"""
+        snapshot_sig = _file_signature(self.snapshot_path) if os.path.exists(self.snapshot_path) else None
+        try:
+            log_stat = os.stat(self.log_path)
+            log_inode, log_size = log_stat.st_ino, log_stat.st_size
+        except FileNotFoundError:
+            log_inode, log_size = None, 0
+
+        position = self._position
+        if position is None or position[0] != snapshot_sig or position[1] != log_inode or log_size < position[2]:
+            # First read, or another process compacted the log: rebuild
+            self._requests = {}
+            self._by_user = {}
+            self._events = 0
+            for request_id, request in _read_json(self.snapshot_path).items():
+                self._requests[request_id] = request
+                self._index(request_id, request)
+            offset = 0
+        else:
+            offset = position[2]
+
+        if log_size > offset:
+            with open(self.log_path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read(log_size - offset)
+            # A line is only complete once its newline has been written
+            chunk = chunk[:chunk.rfind(b'\n') + 1]
+            if METRICS is not None:
+                METRICS.inc('hackmate_file_reads_total', format='jsonl')
+                METRICS.inc('hackmate_bytes_parsed_total', len(chunk), format='jsonl')
+            for line in chunk.splitlines():
+                if line.strip():
+                    self._apply(json.loads(line))
+                    self._events += 1
+            offset += len(chunk)
+        self._position = (snapshot_sig, log_inode, offset)
+
+    def _append(self, events):
+        """Append events to the log; the caller holds the log's file lock"""
+        payload = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events).encode('utf-8')
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        fd = os.open(self.log_path, flags, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if METRICS is not None:
+            METRICS.inc('hackmate_file_writes_total', format='jsonl')
+            METRICS.inc('hackmate_bytes_written_total', len(payload), format='jsonl')
+        # The view is already current, so this only replays the new lines
+        self._refresh()
+        if self._events >= self.COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Fold the log into the snapshot and start a new empty log"""
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            _write_json_atomic(self.snapshot_path, dict(self._requests))
+            _write_json_atomic_bytes(self.log_path, b'')
+            self._position = None
+            self._refresh()
+
+    def revision(self):
+        """Token that changes whenever the snapshot or the log is written"""
+        signatures = []
+        for path in (self.snapshot_path, self.log_path):
+            signatures.append(_file_signature(path) if os.path.exists(path) else None)
+        return tuple(signatures)
+
+    @timed
+    def all(self):
+        with self._lock:
+            self._refresh()
+            return dict(self._requests)
+
+    @timed
+    def get(self, request_id):
+        with self._lock:
+            self._refresh()
+            return self._requests.get(request_id)
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._requests)
+
+    def for_user(self, username):
+        with self._lock:
+            self._refresh()
+            return [(request_id, self._requests[request_id])
+                    for request_id in self._by_user.get(username, {})]
+
+    @timed
+    def put_many(self, requests):
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            before = self.revision()
+            self._append([{'op': 'create', 'id': request_id, 'request': request}
+                          for request_id, request in requests.items()])
+            return before, self.revision()
+
+    @timed
+    def update(self, request_id, updates):
+        with self._lock, file_lock(self.log_path):
+            self._refresh()
+            if request_id not in self._requests:
+                return False
+            self._append([{'op': 'update', 'id': request_id, 'updates': updates}])
+        return True
+
+class JsonStorage:
+    """Storage backend that keeps each collection in its own JSON file.
+
+    Team requests are journaled: TEAM_REQUESTS_FILE holds the last
+    compacted snapshot and request_log the events appended since.
+    """
+
+    def __init__(self, files=None, request_log=TEAM_REQUESTS_LOG):
+        self.files = dict(files or COLLECTION_FILES)
+        self.requests = RequestJournal(self.files['team_requests'], request_log)
+        self._orders = {}  # collection -> (records, ids in order, id -> position) for paging
+        self._sorted_ids = {}  # collection -> (records, sorted ids) for id range scans
+        self._order_lock = threading.Lock()
+
+    @timed
+    def all(self, collection):
+        """Return every record of a collection as an id -> record dict"""
+        if collection == 'team_requests':
+            return self.requests.all()
+        return load_json(self.files[collection])
+
+    @timed
+    def get(self, collection, record_id):
+        if collection == 'team_requests':
+            return self.requests.get(record_id)
+        return self.all(collection).get(record_id)
+
+    @timed
+    def get_many(self, collection, record_ids):
+        """Return the id -> record dict of those record_ids that exist"""
+        records = self.all(collection)
+        return {record_id: records[record_id] for record_id in record_ids if record_id in records}
+
+    def count(self, collection):
+        if collection == 'team_requests':
+            return self.requests.count()
+        return len(self.all(collection))
+
+    @timed
+    def page(self, collection, cursor=None, limit=50, reverse=False):
+        """Up to limit (id, record) pairs in insertion order, or newest first with reverse.
+
+        Paging starts after the record id cursor, or at the start when it is
+        None. Returns the pairs and the cursor for the next page, None once
+        the last page is reached; a cursor for a missing record gives an
+        empty page.
+        """
+        records = self.all(collection)
+        with self._order_lock:
+            order = self._orders.get(collection)
+            if order is None or order[0] is not records:
+                ids = list(records)
+                order = self._orders[collection] = (records, ids, {record_id: pos for pos, record_id in enumerate(ids)})
+        _, ids, positions = order
+        if cursor is not None and cursor not in positions:
+            return [], None
+        # One extra id tells whether another page follows
+        if reverse:
+            end = len(ids) if cursor is None else positions[cursor]
+            ids = ids[max(end - limit - 1, 0):end][::-1]
+        else:
+            start = 0 if cursor is None else positions[cursor] + 1
+            ids = ids[start:start + limit + 1]
+        page_ids = ids[:limit]
+        next_cursor = page_ids[-1] if len(ids) > limit else None
+        return [(record_id, records[record_id]) for record_id in page_ids], next_cursor
+
+    def revision(self, collection):
+        """Token that changes whenever the collection is written"""
+        if collection == 'team_requests':
+            return self.requests.revision()
+        path = os.path.abspath(self.files[collection])
+        return _file_signature(path) if os.path.exists(path) else None
+
+    @timed
+    def id_range(self, collection, start, end):
+        """Return the id -> record dict of records with start <= id < end, in id order"""
+        records = self.all(collection)
+        with self._order_lock:
+            cached = self._sorted_ids.get(collection)
+            if cached is None or cached[0] is not records:
+                cached = self._sorted_ids[collection] = (records, sorted(records))
+        ids = cached[1]
+        return {record_id: records[record_id]
+                for record_id in ids[bisect.bisect_left(ids, start):bisect.bisect_left(ids, end)]}
+
+    @timed
+    def put(self, collection, record_id, record):
+        """Insert or replace a single record.
+
+        Like put_many, returns the collection revision before and after the
+        write so derived indexes can apply the change incrementally.
+        """
+        return self.put_many(collection, {record_id: record})
+
+    @timed
+    def put_many(self, collection, records):
+        """Insert or replace several records in one write"""
+        if collection == 'team_requests':
+            return self.requests.put_many(records)
+        with file_lock(self.files[collection]):
+            before = self.revision(collection)
+            with json_transaction(self.files[collection]) as data:
+                data.update(records)
+            return before, self.revision(collection)
+
+    @timed
+    def update(self, collection, record_id, updates):
+        """Merge updates into an existing record; returns False if it is missing"""
+        if collection == 'team_requests':
+            return self.requests.update(record_id, updates)
+        with json_transaction(self.files[collection]) as data:
+            if record_id not in data:
+                return False
+            data[record_id] = {**data[record_id], **updates}
+        return True
+
+    @timed
+    def find_requests_for_user(self, username):
+        """Return (id, request) pairs sent to or from a user"""
+        return self.requests.for_user(username)
+
+class SQLiteStorage:
+    """Storage backend with one indexed SQLite table per collection.
+
+    Records are stored as JSON documents next to a few indexed columns, so
+    inserts and updates touch a single row instead of rewriting a file.
+    """
+
+    # Columns copied out of each record so they can be indexed and queried
+    INDEXED_COLUMNS = {
+        'users': ('name',),
+        'teams': ('name',),
+        'quick_teams': ('name',),
+        'team_requests': ('team_id', 'from_user', 'to_user', 'status'),
+    }
+
+    def __init__(self, db_path=DATABASE_FILE):
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._transaction() as conn:
+            for collection, columns in self.INDEXED_COLUMNS.items():
+                column_defs = ''.join(f", {col} TEXT" for col in columns)
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {collection} "
+                             f"(id TEXT PRIMARY KEY{column_defs}, data TEXT NOT NULL)")
+                for col in columns:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{collection}_{col} "
+                                 f"ON {collection}({col})")
+            # Write counters so derived indexes can tell when a table changed
+            conn.execute("CREATE TABLE IF NOT EXISTS revisions "
+                         "(collection TEXT PRIMARY KEY, revision INTEGER NOT NULL)")
+            conn.executemany("INSERT OR IGNORE INTO revisions VALUES (?, 0)",
+                             [(collection,) for collection in self.INDEXED_COLUMNS])
+
+    def _connection(self):
+        """One connection per thread; Streamlit serves each session on its own thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _bump_revision(self, conn, collection):
+        before = conn.execute("SELECT revision FROM revisions WHERE collection = ?",
+                              (collection,)).fetchone()[0]
+        conn.execute("UPDATE revisions SET revision = ? WHERE collection = ?", (before + 1, collection))
+        return before, before + 1
+
+    def _row_values(self, collection, record_id, record):
+        columns = self.INDEXED_COLUMNS[collection]
+        values = [record_id] + [record.get(col) for col in columns]
+        return values + [json.dumps(record, ensure_ascii=False)]
+
+    def _decoded(self, rows):
+        """(id, record) pairs of (id, data) rows, counted as one read when metrics are on"""
+        rows = list(rows)
+        if METRICS is not None:
+            METRICS.inc('hackmate_file_reads_total', format='sqlite')
+            METRICS.inc('hackmate_bytes_parsed_total', sum(len(data.encode()) for _, data in rows),
+                        format='sqlite')
+        return [(record_id, json.loads(data)) for record_id, data in rows]
+
+    def _count_write(self, documents):
+        if METRICS is not None:
+            METRICS.inc('hackmate_file_writes_total', format='sqlite')
+            METRICS.inc('hackmate_bytes_written_total', sum(len(data.encode()) for data in documents),
+                        format='sqlite')
+
+    @timed
+    def all(self, collection):
+        rows = self._connection().execute(f"SELECT id, data FROM {collection} ORDER BY rowid")
+        return dict(self._decoded(rows))
+
+    @timed
+    def get(self, collection, record_id):
+        row = self._connection().execute(
+            f"SELECT data FROM {collection} WHERE id = ?", (record_id,)).fetchone()
+        return self._decoded([(record_id, row[0])])[0][1] if row else None
+
+    @timed
+    def get_many(self, collection, record_ids, chunk=500):
+        record_ids = list(dict.fromkeys(record_ids))
+        records = {}
+        for start in range(0, len(record_ids), chunk):
+            batch = record_ids[start:start + chunk]
+            rows = self._connection().execute(
+                f"SELECT id, data FROM {collection} WHERE id IN ({', '.join('?' for _ in batch)})", batch)
+            records.update(self._decoded(rows))
+        return records
+
+    def count(self, collection):
+        return self._connection().execute(f"SELECT COUNT(*) FROM {collection}").fetchone()[0]
+
+    @timed
+    def page(self, collection, cursor=None, limit=50, reverse=False):
+        # Keyset paging on rowid, so a page costs the same however deep it is
+        op, order = ('<', 'DESC') if reverse else ('>', 'ASC')
+        where, params = "", ()
+        if cursor is not None:
+            where, params = f"WHERE rowid {op} (SELECT rowid FROM {collection} WHERE id = ?)", (cursor,)
+        rows = self._connection().execute(
+            f"SELECT id, data FROM {collection} {where} ORDER BY rowid {order} LIMIT ?",
+            params + (limit + 1,)).fetchall()
+        items = self._decoded(rows[:limit])
+        return items, (items[-1][0] if len(rows) > limit else None)
+
+    def revision(self, collection):
+        return self._connection().execute(
+            "SELECT revision FROM revisions WHERE collection = ?", (collection,)).fetchone()[0]
+
+    @timed
+    def id_range(self, collection, start, end):
+        # Served from the primary key index
+        rows = self._connection().execute(
+            f"SELECT id, data FROM {collection} WHERE id >= ? AND id < ? ORDER BY id", (start, end))
+        return dict(self._decoded(rows))
+
+    @timed
+    def put(self, collection, record_id, record):
+        return self.put_many(collection, {record_id: record})
+
+    @timed
+    def put_many(self, collection, records):
+        columns = ('id',) + self.INDEXED_COLUMNS[collection] + ('data',)
+        placeholders = ', '.join('?' for _ in columns)
+        # Upsert keeps the original rowid, so replaced records keep their position
+        assignments = ', '.join(f"{col} = excluded.{col}" for col in columns[1:])
+        sql = (f"INSERT INTO {collection} ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT(id) DO UPDATE SET {assignments}")
+        rows = [self._row_values(collection, record_id, record) for record_id, record in records.items()]
+        with self._transaction() as conn:
+            conn.executemany(sql, rows)
+            revisions = self._bump_revision(conn, collection)
+        self._count_write(row[-1] for row in rows)
+        return revisions
+
+    @timed
+    def update(self, collection, record_id, updates):
+        columns = self.INDEXED_COLUMNS[collection]
+        assignments = ', '.join(f"{col} = ?" for col in columns + ('data',))
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT data FROM {collection} WHERE id = ?", (record_id,)).fetchone()
+            if row is None:
+                return False
+            record = self._decoded([(record_id, row[0])])[0][1]
+            record.update(updates)
+            values = self._row_values(collection, record_id, record)
+            conn.execute(f"UPDATE {collection} SET {assignments} WHERE id = ?", values[1:] + [record_id])
+            self._bump_revision(conn, collection)
+        self._count_write([values[-1]])
+        return True
+
+    @timed
+    def find_requests_for_user(self, username):
+        rows = self._connection().execute(
+            "SELECT id, data FROM team_requests WHERE to_user = ? OR from_user = ? ORDER BY rowid",
+            (username, username))
+        return self._decoded(rows)
+
+def migrate_json_to_sqlite(storage, files=None):
+    """Copy JSON collections into an SQLite backend whose tables are still empty"""
+    source = JsonStorage(files)
+    migrated = {}
+    for collection in source.files:
+        if storage.count(collection) == 0:
+            records = source.all(collection)
+            if records:
+                storage.put_many(collection, records)
+                migrated[collection] = len(records)
+    return migrated
+
+@shared_resource
+def get_storage():
+    """Get the storage backend shared by all sessions"""
+    if STORAGE_BACKEND == 'sqlite':
+        storage = SQLiteStorage(DATABASE_FILE)
+        migrate_json_to_sqlite(storage)
+    elif STORAGE_BACKEND == 'json':
+        storage = JsonStorage()
+    else:
+        raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+    encode_saved_profiles(storage)
+    migrate_team_members(storage)
+    return storage
+
+def _compact_skill(skill):
+    return re.sub(r"[\s._/-]+", "", skill.casefold())
+
+def _compile_skill_keys(synonyms):
+    keys = {}
+    for name, aliases in synonyms.items():
+        key = _compact_skill(name)
+        for alias in [name, *aliases]:
+            keys[alias] = keys[_compact_skill(alias)] = key
+    return keys
+
+# Precompiled skill -> key table; the aliases are seeded here, other spellings are added on first use
+SKILL_KEYS = _compile_skill_keys(SKILL_SYNONYMS)
+
+def skill_key(skill):
+    """Canonical key of a skill: synonyms and case, spacing or punctuation variants share one key"""
+    key = SKILL_KEYS.get(skill)
+    if key is None:
+        compact = _compact_skill(skill)
+        key = SKILL_KEYS[skill] = SKILL_KEYS.get(compact, compact)
+    return key
+
+class SkillCanonicalizer:
+    """Maps free-text skills to canonical names when a profile is saved.
+
+    Known names are the SKILL_SYNONYMS entries and the category skill lists,
+    first spelling wins. A skill whose key matches none of them is snapped to
+    a close known skill (typos like "Javascipt"), or else kept as typed with
+    its whitespace tidied.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = categories
+        self.names = {}  # skill key -> canonical name
+        for name in SKILL_SYNONYMS:
+            self.names.setdefault(skill_key(name), name)
+        for source in (categories or {}, SAMPLE_CATEGORIES):
+            for cat_info in source.values():
+                for skills in cat_info.get('domains', {}).values():
+                    for name in skills:
+                        self.names.setdefault(skill_key(name), ' '.join(name.split()))
+        self._keys = list(self.names)
+        self._canonical = {}
+
+    def canonical(self, skill):
+        """Canonical name of one skill"""
+        name = self._canonical.get(skill)
+        if name is None:
+            key = skill_key(skill)
+            name = self.names.get(key)
+            if name is None and len(key) >= SKILL_FUZZY_MIN_LENGTH:
+                close = difflib.get_close_matches(key, self._keys, n=1, cutoff=SKILL_FUZZY_CUTOFF)
+                name = self.names[close[0]] if close else None
+            if name is None:
+                name = ' '.join(skill.split())
+            self._canonical[skill] = name
+        return name
+
+    def canonicalize(self, skills):
+        """Canonical names of a skill list in order, without blanks or duplicates"""
+        names = {}
+        for skill in skills:
+            if skill.strip():
+                name = self.canonical(skill)
+                names.setdefault(skill_key(name), name)
+        return list(names.values())
+
+@shared_resource
+def get_skill_canonicalizer_cache():
+    """Get the holder of the latest skill canonicalizer shared by all sessions"""
+    return {}
+
+def get_skill_canonicalizer():
+    """Get the skill canonicalizer for the current categories"""
+    categories = load_json(CATEGORIES_FILE)
+    cache = get_skill_canonicalizer_cache()
+    canonicalizer = cache.get('canonicalizer')
+    if canonicalizer is None or canonicalizer.categories is not categories:
+        canonicalizer = cache['canonicalizer'] = SkillCanonicalizer(categories)
+    return canonicalizer
+
+def _compact_option(option):
+    return re.sub(r"[\s_-]+", "", option.casefold())
+
+# Compact spelling -> form option, so "weekends" or "Full time" are saved as the form writes them
+AVAILABILITY_KEYS = {_compact_option(option): option for option in AVAILABILITY_OPTIONS}
+
+# Masks are held in uint64 columns; off-form options past this bit share it
+AVAILABILITY_MAX_BIT = 63
+
+# Process-local bit of each off-form availability option (from older or imported profiles), handed
+# out after the form's bits in the order they are met; never saved, so such masks are never stored
+_AVAILABILITY_EXTRA_BITS = {}
+_availability_bits_lock = threading.Lock()
+
+def canonical_availability(availability):
+    """Availability options in form spelling where they match one, without blanks or duplicates"""
+    options = {}
+    for option in availability:
+        if option.strip():
+            options.setdefault(AVAILABILITY_KEYS.get(_compact_option(option), ' '.join(option.split())))
+    return list(options)
+
+def availability_bit(option):
+    """Bit of an availability option: its form position, or a bit of its own for off-form options"""
+    bit = AVAILABILITY_BITS.get(option)
+    if bit is None:
+        key = _compact_option(option)
+        bit = AVAILABILITY_BITS.get(AVAILABILITY_KEYS.get(key))
+        if bit is None:
+            bit = _AVAILABILITY_EXTRA_BITS.get(key)
+            if bit is None:
+                with _availability_bits_lock:
+                    bit = _AVAILABILITY_EXTRA_BITS.setdefault(
+                        key, min(len(AVAILABILITY_OPTIONS) + len(_AVAILABILITY_EXTRA_BITS), AVAILABILITY_MAX_BIT))
+    return bit
+
+def availability_mask(availability):
+    """Bitmask of availability options; see availability_bit"""
+    mask = 0
+    for option in availability:
+        mask |= 1 << availability_bit(option)
+    return mask
+
+# Fields written by earlier profile encodings that nothing reads any more
+_RETIRED_PROFILE_FIELDS = ('skill_ids', 'skill_encoding')
+
+def _encoded(profile, canonicalizer):
+    profile = {key: value for key, value in profile.items() if key not in _RETIRED_PROFILE_FIELDS}
+    profile['skills'] = canonicalizer.canonicalize(profile.get('skills', []))
+    profile['availability'] = canonical_availability(profile.get('availability', []))
+    if all(option in AVAILABILITY_BITS for option in profile['availability']):
+        profile['availability_mask'] = availability_mask(profile['availability'])
+    else:
+        # Off-form options only have process-local bits, so the mask is built when scoring
+        profile.pop('availability_mask', None)
+    profile['profile_encoding'] = PROFILE_ENCODING
+    return profile
+
+def encode_profile(profile):
+    """Canonicalize a profile's skills and availability and attach its availability mask"""
+    encoded = _encoded(profile, get_skill_canonicalizer())
+    profile.clear()
+    profile.update(encoded)
+    return profile
+
+def encode_saved_profiles(storage):
+    """Re-encode profiles saved before the current profile encoding; returns how many were updated"""
+    stale = {user_id: user for user_id, user in storage.all('users').items()
+             if user.get('profile_encoding') != PROFILE_ENCODING}
+    if stale:
+        canonicalizer = get_skill_canonicalizer()
+        storage.put_many('users', {user_id: _encoded(user, canonicalizer) for user_id, user in stale.items()})
+    return len(stale)
+
+def profile_skill_keys(profile):
+    """Distinct skill keys of a profile"""
+    return {skill_key(skill) for skill in profile.get('skills', [])}
+
+# Process-local bit of each skill key for scoring masks; never saved, so masks only compare within a process
+_SKILL_BITS = {}
+_skill_bits_lock = threading.Lock()
+
+def profile_skill_mask(profile):
+    """Transient skill bitmask of a profile, comparable with other masks from this process"""
+    mask = 0
+    for key in profile_skill_keys(profile):
+        bit = _SKILL_BITS.get(key)
+        if bit is None:
+            with _skill_bits_lock:
+                bit = _SKILL_BITS.setdefault(key, len(_SKILL_BITS))
+        mask |= 1 << bit
+    return mask
+
+def experience_rank(profile):
+    """Ordinal EXPERIENCE_LEVELS rank of a profile; missing or unknown levels rank as Intermediate"""
+    return EXPERIENCE_LEVELS.get(profile.get('experience_level'), EXPERIENCE_LEVELS['Intermediate'])
+
+def profile_availability_mask(profile):
+    """Availability bitmask of a profile, from its saved mask when it has one"""
+    mask = profile.get('availability_mask')
+    return availability_mask(profile.get('availability', [])) if mask is None else mask
+
+def add_user_profile(profile):
+    """Add user profile to the database"""
+    encode_profile(profile)
+    revisions = get_storage().put('users', profile['name'], profile)
+    get_profile_matrix_holder().apply(revisions, {profile['name']: profile})
+    get_domain_score_holder().apply(revisions, {profile['name']: profile})
+    get_profile_filter_index_holder().apply(revisions, {profile['name']: profile})
+
+def get_all_users():
+    """Get all user profiles"""
+    users = get_storage().all('users')
+    return list(users.values())
+
+class UlidGenerator:
+    """ULIDs: a 48-bit millisecond timestamp then 80 random bits, in Crockford base32.
+
+    Ids sort by creation time as plain strings. Within one millisecond, or
+    if the clock steps back, the random part is incremented rather than
+    redrawn, so ids from one process are strictly increasing.
+    """
+
+    ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+    def __init__(self):
+        self._last_ms = -1
+        self._last_random = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def encode(cls, ms, random_bits=0):
+        value = ms << 80 | random_bits
+        return ''.join(cls.ALPHABET[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+    def new(self):
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms, self._last_random = ms, int.from_bytes(os.urandom(10), 'big')
+            elif self._last_random < (1 << 80) - 1:
+                self._last_random += 1
+            else:
+                self._last_ms, self._last_random = self._last_ms + 1, 0
+            return self.encode(self._last_ms, self._last_random)
+
+@shared_resource
+def get_id_generator():
+    """Get the ULID generator shared by all sessions"""
+    return UlidGenerator()
+
+def new_record_id(prefix):
+    """A new "<prefix>_<ULID>" record id, made without reading the store"""
+    return f"{prefix}_{get_id_generator().new()}"
+
+def record_id_floor(prefix, moment):
+    """Smallest "<prefix>_<ULID>" id that could be made at or after a datetime"""
+    return f"{prefix}_{UlidGenerator.encode(int(moment.timestamp() * 1000))}"
+
+def new_team_name(prefix):
+    """Display name for a new team: the formation time plus a short unique tail"""
+    return f"{prefix}_{datetime.now().strftime('%H%M%S')}_{get_id_generator().new()[-4:]}"
+
+def teams_formed_since(moment):
+    """Number of teams and quick teams saved at or after a datetime, from an id range scan"""
+    storage = get_storage()
+    # The upper bound leaves out ids from before ULIDs, like "quick_1_20250906065143"
+    until = datetime.now() + timedelta(seconds=1)
+    return sum(len(storage.id_range(collection, record_id_floor(prefix, moment), record_id_floor(prefix, until)))
+               for collection, prefix in (('teams', 'team'), ('quick_teams', 'quick')))
+
+def user_name_index(users):
+    """Name -> user id over a users collection; a user saved under its own name wins a shared name"""
+    index = {}
+    for user_id, user in users.items():
+        name = user.get('name', user_id)
+        if name == user_id or name not in index:
+            index[name] = user_id
+    return index
+
+@shared_resource
+def get_user_name_index_cache():
+    """Get the holder of the latest user name index shared by all sessions"""
+    return {}
+
+def get_user_name_index():
+    """Get the name -> user id index for the current users collection"""
+    storage = get_storage()
+    revision = storage.revision('users')
+    cache = get_user_name_index_cache()
+    entry = cache.get('index')
+    if entry is None or entry[0] != revision:
+        entry = cache['index'] = (revision, user_name_index(storage.all('users')))
+    return entry[1]
+
+def resolve_member_ids(names, users=None):
+    """User id of each member name that has a saved profile.
+
+    Users saved under their own name (everyone added through the app) are
+    found with one batched read; the rest, like the sample users stored as
+    "alex_chen", go through the name index of users, if given, or of the
+    users collection.
+    """
+    names = set(names)
+    if users is not None:
+        index = user_name_index(users)
+        return {name: index[name] for name in names if name in index}
+    ids = {name: name for name in get_storage().get_many('users', list(names))}
+    if len(ids) < len(names):
+        index = get_user_name_index()
+        ids.update((name, index[name]) for name in names - ids.keys() if name in index)
+    return ids
+
+def team_records(teams_data, users=None):
+    """Storable copies of teams, with each member replaced by its user id.
+
+    Members are resolved by name with resolve_member_ids (against users, if
+    given). Those without a saved profile keep a copy under archived_members
+    so the team can still show them.
+    """
+    ids = resolve_member_ids((member['name'] for team in teams_data for member in team.get('members', [])), users)
+    records = []
+    for team in teams_data:
+        record = {key: value for key, value in team.items() if key != 'members'}
+        if 'members' in team:
+            record['member_ids'] = [ids.get(member['name'], member['name']) for member in team['members']]
+            archived = {member['name']: member for member in team['members'] if member['name'] not in ids}
+            if archived:
+                record['archived_members'] = {**team.get('archived_members', {}), **archived}
+        records.append(record)
+    return records
+
+def join_team_members(teams):
+    """Teams with their member ids resolved to user profiles, from one batched read of the users"""
+    users = get_storage().get_many(
+        'users', {member_id for team in teams for member_id in team.get('member_ids', ())})
+    joined = []
+    for team in teams:
+        if 'member_ids' in team:
+            archived = team.get('archived_members', {})
+            team = {**team, 'members': [users.get(member_id) or archived.get(member_id) or {'name': member_id}
+                                        for member_id in team['member_ids']]}
+        joined.append(team)
+    return joined
+
+def _resolve_archived_members(team, index):
+    """team with archived members who have since been found in index pointed at their user ids"""
+    archived = dict(team['archived_members'])
+    member_ids = []
+    for member_id in team.get('member_ids', ()):
+        if member_id in archived and member_id in index:
+            del archived[member_id]
+            member_id = index[member_id]
+        member_ids.append(member_id)
+    team = {key: value for key, value in team.items() if key != 'archived_members'}
+    team['member_ids'] = member_ids
+    if archived:
+        team['archived_members'] = archived
+    return team
+
+def migrate_team_members(storage):
+    """Rewrite teams saved with embedded member profiles to store user ids; returns how many changed.
+
+    Also re-resolves archived members of teams migrated before members were
+    looked up by name, so the sample users stop being kept as copies.
+    """
+    users = storage.all('users')
+    index = user_name_index(users)
+    changed = 0
+    for collection in TEAM_COLLECTIONS:
+        teams = storage.all(collection)
+        stale = {team_id: team for team_id, team in teams.items() if 'members' in team}
+        records = dict(zip(stale, team_records(list(stale.values()), users)))
+        records.update((team_id, _resolve_archived_members(team, index)) for team_id, team in teams.items()
+                       if 'members' not in team and any(name in index for name in team.get('archived_members', ())))
+        if records:
+            storage.put_many(collection, records)
+            changed += len(records)
+    return changed
+
+def _add_teams(collection, teams_data, prefix):
+    """Insert teams under fresh ids and fold them into the shared aggregates and team stats; returns the ids"""
+    record_ids = [new_record_id(prefix) for _ in teams_data]
+    records = team_records(teams_data)
+    revisions = get_storage().put_many(collection, dict(zip(record_ids, records)))
+    get_team_aggregates_holder().apply(collection, revisions, teams_data)
+    stats_cache = get_team_stats_cache()
+    for record_id, record, team in zip(record_ids, records, teams_data):
+        if 'members' in team:
+            stats_cache.seed(collection, record_id, record['member_ids'], team['members'])
+    return record_ids
+
+def save_team(team_data):
+    """Save team data"""
+    return _add_teams('teams', [team_data], 'team')[0]
+
+def get_all_teams():
+    """Get all teams"""
+    teams = get_storage().all('teams')
+    return join_team_members(list(teams.values()))
+
+def save_quick_team(quick_team_data):
+    """Save quick team data"""
+    return _add_teams('quick_teams', [quick_team_data], 'quick')[0]
+
+def save_quick_teams(quick_teams_data):
+    """Save several quick teams in one write"""
+    return _add_teams('quick_teams', quick_teams_data, 'quick')
+
+def get_quick_teams():
+    """Get all quick teams"""
+    quick_teams = get_storage().all('quick_teams')
+    return join_team_members(list(quick_teams.values()))
+
+def get_team_requests():
+    """Get all team requests"""
+    return get_storage().all('team_requests')
+
+def save_team_request(request_data):
+    """Save a team request"""
+    return save_team_requests([request_data])[0]
+
+def save_team_requests(requests_data):
+    """Save several team requests in one write; returns their ids"""
+    request_ids = [new_record_id('request') for _ in requests_data]
+    get_storage().put_many('team_requests', dict(zip(request_ids, requests_data)))
+    return request_ids
+
+def update_team_request(request_id, updates):
+    """Update a team request"""
+    return get_storage().update('team_requests', request_id, updates)
+
+def get_user_team_requests(username):
+    """Get all team requests for a specific user"""
+    return get_storage().find_requests_for_user(username)
+
+def get_team_by_id(team_id):
+    """Get a specific team by ID"""
+    team = get_storage().get('teams', team_id)
+    return join_team_members([team])[0] if team else None
+
+def update_team(team_id, updates):
+    """Update a team; a new member list also refreshes its stored compatibility.
+
+    The compatibility comes from the team's cached TeamStats, updated with
+    only the members who joined or left.
+    """
+    storage = get_storage()
+    if 'members' in updates:
+        team = storage.get('teams', team_id)
+        if team is None:
+            return False
+        members = updates['members']
+        updates = team_records([updates])[0]
+        stats = get_team_stats_cache().change('teams', team_id, team.get('member_ids', ()),
+                                              updates['member_ids'], members)
+        updates['compatibility'] = stats.compatibility
+    return storage.update('teams', team_id, updates)
+
+def add_team_member(team_id, member_name):
+    """Add a saved user to a team; returns False if the team or user is missing or already a member"""
+    team = get_team_by_id(team_id)
+    member_id = resolve_member_ids([member_name]).get(member_name)
+    if team is None or member_id is None or member_id in team.get('member_ids', ()):
+        return False
+    member = get_storage().get('users', member_id)
+    return update_team(team_id, {'members': team['members'] + [member]})
+
+def accept_team_request(request_id, request):
+    """Mark a team request accepted and add the user it brings in to its team.
+
+    Invitations bring in the invited user, join requests the sender.
+    """
+    update_team_request(request_id, {'status': 'accepted'})
+    invited = request.get('type') == 'invitation' or request.get('from_user') == "System"
+    add_team_member(request.get('team_id'), request['to_user'] if invited else request.get('from_user'))
+
+class TeamAggregates:
+    """Running totals over the teams and quick_teams collections.
+
+    Built once from storage and then updated as teams are saved, so the
+    home, find-teams and analytics pages read their counts without walking
+    every team and member.
+    """
+
+    def __init__(self, teams=(), quick_teams=()):
+        self.counts = {'teams': 0, 'quick_teams': 0}
+        self.size_counts = {}  # member count -> number of teams
+        self.skill_counts = {}  # skill -> number of team members listing it
+        self.member_total = 0
+        self.compatibility_total = 0
+        self.active = 0
+        self.looking_for_members = 0
+        self.recent_quick_teams = deque(maxlen=3)
+        self.revisions = {}
+        self.add('quick_teams', quick_teams)
+        self.add('teams', teams)
+
+    def add(self, collection, teams):
+        """Count newly saved teams of one collection"""
+        for team in teams:
+            members = team.get('members', [])
+            self.counts[collection] += 1
+            self.size_counts[len(members)] = self.size_counts.get(len(members), 0) + 1
+            self.member_total += len(members)
+            self.compatibility_total += team.get('compatibility', 0)
+            self.active += team.get('status', 'active') == 'active'
+            self.looking_for_members += len(members) < team.get('target_size', 4)
+            for member in members:
+                for skill in member.get('skills', []):
+                    self.skill_counts[skill] = self.skill_counts.get(skill, 0) + 1
+            if collection == 'quick_teams':
+                self.recent_quick_teams.append(team)
+
+    @property
+    def total(self):
+        return self.counts['teams'] + self.counts['quick_teams']
+
+    @property
+    def average_size(self):
+        return self.member_total / self.total if self.total else 0
+
+    @property
+    def average_compatibility(self):
+        return self.compatibility_total / self.total if self.total else 0
+
+    def top_skills(self, n=10):
+        """(skill, count) pairs of the n most common member skills, ties in skill order"""
+        return heapq.nsmallest(n, self.skill_counts.items(), key=lambda item: (-item[1], item[0]))
+
+class TeamAggregatesHolder:
+    """Keeps the shared TeamAggregates in step with the team collections"""
+
+    def __init__(self):
+        self._aggregates = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        storage = get_storage()
+        revisions = {collection: storage.revision(collection) for collection in TEAM_COLLECTIONS}
+        with self._lock:
+            if self._aggregates is None or self._aggregates.revisions != revisions:
+                aggregates = TeamAggregates(get_all_teams(), get_quick_teams())
+                aggregates.revisions = revisions
+                self._aggregates = aggregates
+            return self._aggregates
+
+    def apply(self, collection, revisions, teams):
+        """Count freshly added teams if the aggregates were current before the write"""
+        before, after = revisions
+        with self._lock:
+            if self._aggregates is not None and self._aggregates.revisions.get(collection) == before:
+                self._aggregates.add(collection, teams)
+                self._aggregates.revisions[collection] = after
+
+@shared_resource
+def get_team_aggregates_holder():
+    """Get the team aggregates holder shared by all sessions"""
+    return TeamAggregatesHolder()
+
+def get_team_aggregates():
+    """Get team counts, averages and skill frequencies for the current teams"""
+    return get_team_aggregates_holder().get()
+
+# ML Skillset Enhancer Functions
+class ProfileMatrix:
+    """Sparse user x skill matrix that grows one profile at a time.
+
+    Rows are kept in CSR form over a vocabulary that only ever grows, with
+    row norms cached, so scoring every profile against one skill set is a
+    single sparse mat-vec. Availability (one bitmask per row), experience
+    level, the skill and domain counts and per-domain row lists are kept
+    alongside. Re-adding a profile
+    retires its old row but keeps its place in the user order; retired rows
+    are dropped once they outnumber the live ones.
+    """
+
+    def __init__(self, profiles=(), ids=None):
+        self.vocabulary = {}  # lowercase skill -> column
+        self.ids = []  # row -> user record id
+        self.profiles = []  # row -> profile dict, None once retired
+        self.rows = {}  # user record id -> live row
+        self.name_rows = {}  # user name -> live rows with that name
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._norms = np.zeros(0)
+        self._availability = np.zeros(0, dtype=np.uint64)
+        self._experience = np.zeros(0, dtype=np.int8)
+        self._skill_totals = np.zeros(0, dtype=np.int32)  # len(profile['skills'])
+        self._domain_totals = np.zeros(0, dtype=np.int32)  # distinct domains
+        self.domain_rows = {}  # domain -> rows in it, retired ones included
+        self._order = np.zeros(0, dtype=np.int64)  # position in the users collection
+        self._alive = np.zeros(0, dtype=bool)
+        self._index_row = np.zeros(0, dtype=np.int64)  # row -> skill index row, -1 if not covered
+        self._index_map = None  # skill index row -> live row, -1 if none
+        self.index = None
+        self._n_rows = 0
+        self._nnz = 0
+        self._retired = 0
+        self._csr = None
+        self.revision = None
+        self.lock = threading.RLock()
+        # Plain profile lists are keyed by position
+        self.extend(zip(ids, profiles) if ids is not None else enumerate(profiles))
+
+    def __len__(self):
+        """Number of live profiles"""
+        return len(self.rows)
+
+    def skill_columns(self, skills, grow=False):
+        """Sorted vocabulary columns of a skill list; unknown skills are skipped unless grow"""
+        columns = set()
+        for skill in skills:
+            skill = skill_key(skill)
+            column = self.vocabulary.get(skill)
+            if column is None and grow:
+                column = self.vocabulary[skill] = len(self.vocabulary)
+            if column is not None:
+                columns.add(column)
+        return sorted(columns)
+
+    def _reserve(self, n_rows, nnz):
+        if n_rows + 1 > len(self._indptr):
+            size = max(n_rows + 1, 2 * len(self._indptr))
+            self._indptr = np.resize(self._indptr, size)
+            self._norms = np.resize(self._norms, size)
+            self._availability = np.resize(self._availability, size)
+            self._experience = np.resize(self._experience, size)
+            self._skill_totals = np.resize(self._skill_totals, size)
+            self._domain_totals = np.resize(self._domain_totals, size)
+            self._order = np.resize(self._order, size)
+            self._alive = np.resize(self._alive, size)
+            self._index_row = np.resize(self._index_row, size)
+        if nnz > len(self._indices):
+            self._indices = np.resize(self._indices, max(nnz, 2 * len(self._indices)))
+
+    def extend(self, records):
+        """Append or replace rows for (record id, profile) pairs"""
+        with self.lock:
+            for record_id, profile in records:
+                columns = self.skill_columns(profile.get('skills', []), grow=True)
+                old_row = self.rows.get(record_id)
+                order = self._order[old_row] if old_row is not None else len(self.rows)
+                if old_row is not None:
+                    self._norms[old_row] = 0
+                    self._alive[old_row] = False
+                    if self._index_row[old_row] >= 0:
+                        self._index_map[self._index_row[old_row]] = -1
+                    self.name_rows[self.profiles[old_row]['name']].discard(old_row)
+                    self.profiles[old_row] = None
+                    self._retired += 1
+                row = self._n_rows
+                self._reserve(row + 1, self._nnz + len(columns))
+                self._indices[self._nnz:self._nnz + len(columns)] = columns
+                self._nnz += len(columns)
+                self._indptr[row + 1] = self._nnz
+                self._norms[row] = np.sqrt(len(columns))
+                self._availability[row] = profile_availability_mask(profile)
+                self._experience[row] = experience_rank(profile)
+                self._skill_totals[row] = len(profile.get('skills', []))
+                domains = set(profile.get('domain', []))
+                self._domain_totals[row] = len(domains)
+                for domain in domains:
+                    self.domain_rows.setdefault(domain, []).append(row)
+                self._order[row] = order
+                self._alive[row] = True
+                self._index_row[row] = -1
+                self.ids.append(record_id)
+                self.profiles.append(profile)
+                self.rows[record_id] = row
+                self.name_rows.setdefault(profile['name'], set()).add(row)
+                self._n_rows += 1
+            self._csr = None
+            if self._retired > len(self.rows):
+                self._compact()
+
+    def _compact(self):
+        live = sorted(self.rows.values(), key=lambda row: self._order[row])
+        fresh = ProfileMatrix([self.profiles[row] for row in live], [self.ids[row] for row in live])
+        lock, revision, index = self.lock, self.revision, self.index
+        self.__dict__.update(fresh.__dict__)
+        self.lock, self.revision = lock, revision
+        if index is not None:
+            self.attach_index(index)
+
+    def matrix(self):
+        """CSR view of the live and retired rows"""
+        with self.lock:
+            if self._csr is None:
+                # scipy.sparse takes longer to import than the rest of the engine, so load it on first use
+                from scipy import sparse
+                data = np.ones(self._nnz)
+                self._csr = sparse.csr_matrix(
+                    (data, self._indices[:self._nnz], self._indptr[:self._n_rows + 1]),
+                    shape=(self._n_rows, max(len(self.vocabulary), 1)))
+            return self._csr
+
+    def similarities(self, skills, rows=None):
+        """Cosine similarity of every row (or just rows) with a skill list; retired rows score 0"""
+        with self.lock:
+            user_skills = set(map(skill_key, skills))
+            columns = self.skill_columns(user_skills)
+            matrix = self.matrix()
+            norms = self._norms[:self._n_rows]
+            if rows is not None:
+                matrix, norms = matrix[rows], norms[rows]
+        if not user_skills:
+            return np.zeros(len(norms))
+        user_vec = np.zeros(matrix.shape[1])
+        user_vec[columns] = 1
+        dots = matrix @ user_vec
+        denom = norms * np.sqrt(len(user_skills))
+        return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+    def order(self):
+        """Position of each row's profile in the users collection, for tie-breaking"""
+        return self._order[:self._n_rows]
+
+    def candidate_mask(self, user_profile, require_overlap=True, rows=None):
+        """Live rows other than the user, optionally sharing an availability slot.
+
+        As before, an empty availability on either side counts as a match.
+        With rows, the mask covers just those rows, in that order.
+        """
+        with self.lock:
+            own_rows = list(self.name_rows.get(user_profile.get('name'), ()))
+            if rows is None:
+                mask = self._alive[:self._n_rows].copy()
+                cand_avail = self._availability[:self._n_rows]
+            else:
+                mask = self._alive[rows]
+                cand_avail = self._availability[rows]
+                own_rows = np.flatnonzero(np.isin(rows, own_rows))
+            mask[own_rows] = False
+            user_avail = user_profile.get('availability', [])
+            if require_overlap and user_avail:
+                user_mask = np.uint64(availability_mask(user_avail))
+                mask &= (cand_avail == 0) | ((cand_avail & user_mask) != 0)
+            return mask
+
+    def attach_index(self, index):
+        """Shortlist through a SkillLSHIndex, or stop with None.
+
+        A live row counts as covered only if the index holds its record id
+        with the same skill signature; anything saved since the index was
+        built is left uncovered and always scanned.
+        """
+        with self.lock:
+            self.index = index
+            self._index_row[:self._n_rows] = -1
+            self._index_map = None
+            if index is None:
+                return
+            live = np.flatnonzero(self._alive[:self._n_rows])
+            index_rows = index.lookup([self.ids[row] for row in live])
+            keys = index.signature_keys(self.matrix()[live], list(self.vocabulary))
+            covered = index_rows >= 0
+            covered[covered] = (index.signatures[index_rows[covered]] == keys[covered]).all(axis=1)
+            self._index_row[live[covered]] = index_rows[covered]
+            self._index_map = np.full(index.count, -1, dtype=np.int64)
+            self._index_map[index_rows[covered]] = live[covered]
+
+    def shortlist(self, skills, probes=None):
+        """Rows the attached index puts near a skill list, plus every live row it does not cover"""
+        with self.lock:
+            n_rows = self._n_rows
+            selected = self._alive[:n_rows] & (self._index_row[:n_rows] < 0)
+            hits = self._index_map[self.index.candidates(skills, probes)]
+            selected[hits[hits >= 0]] = True
+            return np.flatnonzero(selected)
+
+def top_k_indices(scores, k, mask=None, order=None):
+    """Indices of the k best scores, best first, in O(n).
+
+    Rows outside mask are never picked. Ties go to the lower order value
+    (the index by default), which matches a stable descending sort.
+    """
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+    values = scores[candidates]
+    ranks = order[candidates] if order is not None else candidates
+    if k <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    if k < len(candidates):
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)
+        ties = ties[np.argsort(ranks[ties], kind='stable')][:k - len(above)]
+        picked = np.concatenate([above, ties])
+    else:
+        picked = np.arange(len(candidates))
+    best_first = np.lexsort((ranks[picked], -values[picked]))
+    return candidates[picked[best_first]]
+
+class SkillLSHIndex:
+    """Random-projection LSH over skill vectors, for approximate cosine search.
+
+    Each skill gets a fixed pseudo-random Gaussian vector derived from its
+    name, so a profile's signature (the signs of the sum of its skill
+    vectors) does not depend on any vocabulary. Signatures are cut into
+    `tables` keys of `bits` bits, and profiles sharing a key with the query
+    in any table are candidates. More tables raise recall at build time;
+    more probes, which also try keys with the query's least certain bits
+    flipped, raise it at query time. Both cost latency. Every table is a
+    pair of sorted arrays saved as .npy files and memory-mapped on load.
+    """
+
+    FORMAT = 2
+
+    def __init__(self, tables=16, bits=12, seed=0):
+        if not 0 < bits <= 32:
+            raise ValueError("bits must be between 1 and 32")
+        self.tables, self.bits, self.seed = tables, bits, seed
+        self.count = 0
+        self.sorted_ids = np.zeros(0, dtype='S1')  # record ids, utf-8, sorted
+        self.id_rows = np.zeros(0, dtype=np.int32)  # index row of each sorted id
+        self.signatures = np.zeros((0, tables), dtype=np.uint32)  # row -> key per table
+        self.keys = np.zeros((tables, 0), dtype=np.uint32)  # table -> sorted keys
+        self.rows = np.zeros((tables, 0), dtype=np.int32)  # table -> rows in key order
+        self._weights = np.left_shift(np.uint32(1), np.arange(bits, dtype=np.uint32))
+        self._projections = {}
+
+    @classmethod
+    def build(cls, users, tables=16, bits=None, seed=0):
+        """Index an id -> profile dict.
+
+        By default keys get about one bit per doubling of the population
+        past 256, which keeps buckets to a few hundred profiles.
+        """
+        if bits is None:
+            bits = min(32, max(8, round(math.log2(max(len(users), 1) / 256))))
+        index = cls(tables, bits, seed)
+        matrix = ProfileMatrix(list(users.values()), list(users.keys()))
+        signatures = index.signature_keys(matrix.matrix(), list(matrix.vocabulary))
+        ids = np.array([str(user_id).encode('utf-8') for user_id in users], dtype=bytes)
+        index.count = len(users)
+        index.id_rows = np.argsort(ids, kind='stable').astype(np.int32)
+        index.sorted_ids = ids[index.id_rows]
+        index.signatures = signatures
+        index.rows = np.argsort(signatures, axis=0, kind='stable').T.astype(np.int32)
+        index.keys = np.take_along_axis(signatures, index.rows.T, axis=0).T.copy()
+        return index
+
+    def projection(self, skills):
+        """One fixed Gaussian row per skill key"""
+        width = self.tables * self.bits
+        out = np.empty((len(skills), width), dtype=np.float32)
+        for i, skill in enumerate(skills):
+            vector = self._projections.get(skill)
+            if vector is None:
+                digest = hashlib.blake2b(skill.encode('utf-8'), digest_size=8,
+                                         key=str(self.seed).encode('utf-8')).digest()
+                rng = np.random.default_rng(int.from_bytes(digest, 'little'))
+                vector = self._projections[skill] = rng.standard_normal(width, dtype=np.float32)
+            out[i] = vector
+        return out
+
+    def _pack(self, projected):
+        bits = (projected > 0).reshape(len(projected), self.tables, self.bits)
+        return (bits * self._weights).sum(axis=2, dtype=np.uint32)
+
+    def signature_keys(self, csr, vocabulary, chunk=65536):
+        """Table keys for each row of a profile x skill CSR matrix over vocabulary"""
+        projection = np.zeros((csr.shape[1], self.tables * self.bits), dtype=np.float32)
+        projection[:len(vocabulary)] = self.projection(vocabulary)
+        keys = np.empty((csr.shape[0], self.tables), dtype=np.uint32)
+        for start in range(0, csr.shape[0], chunk):
+            keys[start:start + chunk] = self._pack(np.asarray(csr[start:start + chunk] @ projection))
+        return keys
+
+    def lookup(self, record_ids):
+        """Index row of each record id, -1 for ids it does not hold"""
+        if not record_ids or not self.count:
+            return np.full(len(record_ids), -1, dtype=np.int64)
+        query = np.array([str(record_id).encode('utf-8') for record_id in record_ids])
+        pos = np.minimum(np.searchsorted(self.sorted_ids, query), self.count - 1)
+        return np.where(self.sorted_ids[pos] == query, self.id_rows[pos], -1).astype(np.int64)
+
+    def candidates(self, skills, probes=None):
+        """Rows sharing a bucket with a skill list in any table, after probing"""
+        probes = SKILL_INDEX_PROBES if probes is None else probes
+        skills = list(dict.fromkeys(map(skill_key, skills)))
+        projected = self.projection(skills).sum(axis=0).reshape(self.tables, self.bits)
+        keys = self._pack(projected.reshape(1, -1))[0]
+        found = []
+        for table in range(self.tables):
+            probe_keys = [keys[table]]
+            # The bits closest to the hyperplane are the likeliest to differ in a near neighbour
+            for bit in np.argsort(np.abs(projected[table]))[:probes]:
+                probe_keys.append(keys[table] ^ self._weights[bit])
+            table_keys = self.keys[table]
+            for key in probe_keys:
+                start = np.searchsorted(table_keys, key, side='left')
+                end = np.searchsorted(table_keys, key, side='right')
+                found.append(self.rows[table][start:end])
+        seen = np.zeros(self.count, dtype=bool)
+        for rows in found:
+            seen[rows] = True
+        return np.flatnonzero(seen)
+
+    def save(self, path):
+        """Write the index to a directory.
+
+        Arrays go to fresh files and meta.json is replaced last, so readers
+        see either the old index or the new one.
+        """
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        stale = set()
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                stale = set(json.load(f).get('files', {}).values())
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        files = {}
+        for name in ('sorted_ids', 'id_rows', 'signatures', 'keys', 'rows'):
+            files[name] = f"{name}-{stamp}.npy"
+            with open(os.path.join(path, files[name]), 'wb') as f:
+                np.save(f, getattr(self, name))
+                f.flush()
+                os.fsync(f.fileno())
+        meta = {'format': self.FORMAT, 'tables': self.tables, 'bits': self.bits, 'seed': self.seed,
+                'count': self.count, 'built': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'files': files}
+        _write_json_atomic_bytes(meta_path, json.dumps(meta, indent=4).encode('utf-8'))
+        for filename in stale - set(files.values()):
+            try:
+                os.remove(os.path.join(path, filename))
+            except OSError:
+                pass
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map an index written by save"""
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format') != cls.FORMAT:
+            raise ValueError(f"Unsupported skill index format: {meta.get('format')}")
+        index = cls(meta['tables'], meta['bits'], meta['seed'])
+        index.count = meta['count']
+        if index.count:
+            for name, filename in meta['files'].items():
+                setattr(index, name, np.load(os.path.join(path, filename), mmap_mode='r'))
+        return index
+
+@shared_resource
+def get_skill_index_cache():
+    """Get the holder of the loaded skill index shared by all sessions"""
+    return {}
+
+def get_skill_index():
+    """Get the ANN skill index saved in SKILL_INDEX_DIR, or None if there is none"""
+    meta_path = os.path.join(SKILL_INDEX_DIR, 'meta.json')
+    signature = _file_signature(meta_path) if os.path.exists(meta_path) else None
+    cache = get_skill_index_cache()
+    if 'index' not in cache or cache['signature'] != signature:
+        index = None
+        if signature is not None:
+            try:
+                index = SkillLSHIndex.load(SKILL_INDEX_DIR)
+            except Exception as e:
+                report_error(f"Error loading skill index: {str(e)}")
+        cache['signature'], cache['index'] = signature, index
+    return cache['index']
+
+class ProfileMatrixHolder:
+    """Keeps the shared ProfileMatrix in step with the users collection"""
+
+    def __init__(self):
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        revision = get_storage().revision('users')
+        with self._lock:
+            if self._matrix is None or self._matrix.revision != revision:
+                users = get_storage().all('users')
+                matrix = ProfileMatrix(list(users.values()), list(users.keys()))
+                matrix.revision = revision
+                self._matrix = matrix
+            index = get_skill_index()
+            if self._matrix.index is not index:
+                self._matrix.attach_index(index)
+            return self._matrix
+
+    def apply(self, revisions, records):
+        """Add freshly written {id: profile} records if the matrix was current before the write"""
+        before, after = revisions
+        with self._lock:
+            if self._matrix is not None and self._matrix.revision == before:
+                self._matrix.extend(records.items())
+                self._matrix.revision = after
+
+@shared_resource
+def get_profile_matrix_holder():
+    """Get the profile matrix holder shared by all sessions"""
+    return ProfileMatrixHolder()
+
+def get_profile_matrix():
+    """Get the profile matrix for the current set of users"""
+    return get_profile_matrix_holder().get()
+
+@timed
+def rank_similar_profiles(matrix, user_profile, top_k=5, use_index=True, probes=None):
+    """Best (profile, similarity) pairs for a user from a ProfileMatrix.
+
+    With use_index and an attached skill index, only the index shortlist is
+    scored exactly. If that cannot fill top_k with real (non-zero) matches
+    the full scan runs instead, so results only differ from it when the
+    index misses a near neighbour.
+    """
+    skills = user_profile.get('skills', [])
+    with matrix.lock:
+        if use_index and matrix.index is not None and skills:
+            rows = matrix.shortlist(skills, probes)
+            sims = matrix.similarities(skills, rows)
+            mask = matrix.candidate_mask(user_profile, rows=rows) & (sims < 0.999)
+            picked = top_k_indices(sims, top_k, mask, matrix.order()[rows])
+            if len(picked) == top_k and sims[picked[-1]] > 0:
+                return [(matrix.profiles[rows[idx]], sims[idx]) for idx in picked]
+        sims = matrix.similarities(skills)
+        # Drop the user, identical profiles and clashing availability before ranking
+        mask = matrix.candidate_mask(user_profile) & (sims < 0.999)
+        picked = top_k_indices(sims, top_k, mask, matrix.order())
+        return [(matrix.profiles[idx], sims[idx]) for idx in picked]
+
+@timed
+def find_best_matches(user_profile, profiles=None, top_k=5):
+    """Find best matches using cosine similarity.
+
+    Without profiles, every registered user is scored against the shared
+    profile matrix; an explicit list gets a matrix of its own.
+    """
+    if profiles is None:
+        matrix = get_profile_matrix()
+    else:
+        matrix = ProfileMatrix(profiles)
+
+    if not matrix.vocabulary and not user_profile.get('skills'):
+        return []
+
+    try:
+        return rank_similar_profiles(matrix, user_profile, top_k,
+                                     use_index=len(matrix) >= SKILL_INDEX_MIN_PROFILES)
+    except Exception as e:
+        report_error(f"Error in finding matches: {str(e)}")
+        return []
+
+@timed
+def analyze_fit(cat_sel, dom_sel, selected_skills, categories):
+    """Analyze skill fit for a specific domain"""
+    if not categories or cat_sel not in categories or dom_sel not in categories[cat_sel]['domains']:
+        return None
+
+    domain_skills = {skill_key(s): s for s in categories[cat_sel]['domains'][dom_sel]}
+    user_skills = set(map(skill_key, selected_skills))
+
+    matched = {domain_skills[key] for key in user_skills.intersection(domain_skills)}
+    missing = {domain_skills[key] for key in domain_skills.keys() - user_skills}
+
+    max_score = max(len(domain_skills), 10)
+    score = min(100, (len(matched) / max_score) * 100) if max_score > 0 else 0
+
+    if score >= 80:
+        rec = "Excellent fit! Strong skills for this role."
+    elif score >= 60:
+        rec = f"Good fit; consider improving missing skills: {', '.join(list(missing)[:3])}"
+    elif score >= 40:
+        rec = f"Moderate fit; focus on acquiring key skills: {', '.join(list(missing)[:3])}"
+    else:
+        rec = f"Low fit; strongly recommend gaining these skills: {', '.join(list(missing)[:3])}"
+
+    return {
+        "score": score,
+        "matched": matched,
+        "missing": missing,
+        "recommendation": rec,
+    }
+
+def categories_key(categories):
+    """Content hash identifying one version of the categories"""
+    payload = json.dumps(categories, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+class DomainScoreMatrix:
+    """Skill-match counts of every user against every domain of one categories version.
+
+    The domain x skill incidence matrix is built once; all user rows then
+    come from a single sparse product, and saving a profile recomputes just
+    its row. Domains with no skills are left out, and a domain listed under
+    several categories keeps its first position but its last skills, like
+    the dict calculate_domain_scores used to build.
+    """
+
+    def __init__(self, categories, key=None, users=None):
+        self.key = key
+        domains = {}
+        for cat, cat_info in categories.items():
+            for domain, skills in cat_info.get("domains", {}).items():
+                domain_skills = {skill_key(skill): skill for skill in skills}
+                if domain_skills:
+                    domains[domain] = (cat, domain_skills)
+        self.domains = list(domains)
+        self.columns = {domain: col for col, domain in enumerate(self.domains)}
+        self.categories = [domains[domain][0] for domain in self.domains]
+        self.domain_skills = [domains[domain][1] for domain in self.domains]  # skill key -> name
+        self.skill_columns = {}  # domain skill key -> incidence column
+        indices, indptr = [], [0]
+        for domain_skills in self.domain_skills:
+            indices.extend(self.skill_columns.setdefault(skill, len(self.skill_columns))
+                           for skill in domain_skills)
+            indptr.append(len(indices))
+        from scipy import sparse
+        self._incidence = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(self.domains), max(len(self.skill_columns), 1)))
+        self._sizes = np.array([len(skills) for skills in self.domain_skills], dtype=float)
+        # Transposed incidence, for scoring a single profile without building a matrix
+        by_skill = self._incidence.T.tocsr()
+        self._skill_domains = np.split(by_skill.indices, by_skill.indptr[1:-1])
+        self.rows = {}  # user record id -> row
+        self.names = {}  # user name -> row last saved under it
+        self.skills = []  # row -> skills list the row was computed from
+        self._counts = np.zeros((0, len(self.domains)), dtype=np.int32)
+        self.revision = None
+        self.lock = threading.RLock()
+        if users:
+            self.extend(users.items())
+
+    def _skill_indices(self, profile):
+        columns = set(self.skill_columns.get(skill_key(skill)) for skill in profile.get('skills', []))
+        columns.discard(None)
+        return columns
+
+    def _match_counts(self, profiles):
+        indices, indptr = [], [0]
+        for profile in profiles:
+            indices.extend(self._skill_indices(profile))
+            indptr.append(len(indices))
+        from scipy import sparse
+        users = sparse.csr_matrix((np.ones(len(indices)), indices, indptr),
+                                  shape=(len(profiles), self._incidence.shape[1]))
+        return (users @ self._incidence.T).toarray().astype(np.int32)
+
+    def extend(self, records):
+        """Add or recompute rows for (record id, profile) pairs"""
+        records = list(records)
+        counts = self._match_counts([profile for _, profile in records])
+        with self.lock:
+            new_rows = len(self.skills) + sum(1 for record_id, _ in records if record_id not in self.rows)
+            if new_rows > len(self._counts):
+                grown = np.zeros((max(new_rows, 2 * len(self._counts)), len(self.domains)), dtype=np.int32)
+                grown[:len(self._counts)] = self._counts
+                self._counts = grown
+            for (record_id, profile), row_counts in zip(records, counts):
+                row = self.rows.get(record_id)
+                if row is None:
+                    row = self.rows[record_id] = len(self.skills)
+                    self.skills.append(None)
+                self._counts[row] = row_counts
+                self.skills[row] = profile.get('skills', [])
+                self.names[profile['name']] = row
+
+    def counts(self, profile):
+        """Matched skill count of a profile for every domain"""
+        with self.lock:
+            row = self.names.get(profile.get('name'))
+            # Team members are stored as copies, so only trust rows with the same skills
+            if row is not None and self.skills[row] == profile.get('skills', []):
+                return self._counts[row]
+        domains = [self._skill_domains[column] for column in self._skill_indices(profile)]
+        if not domains:
+            return np.zeros(len(self.domains), dtype=np.int32)
+        return np.bincount(np.concatenate(domains), minlength=len(self.domains))
+
+    def scores(self, profile):
+        """Percentage of each domain's skills that a profile has"""
+        return self.counts(profile) / self._sizes * 100
+
+    def score(self, profile, domain):
+        """Score of a profile for one domain, or None if the domain has no skills"""
+        col = self.columns.get(domain)
+        return None if col is None else float(self.scores(profile)[col])
+
+    def best(self, profile):
+        """(domain, score) of a profile's best-matching domain, first one on ties"""
+        if not self.domains:
+            return None
+        scores = self.scores(profile)
+        col = int(np.argmax(scores))
+        return self.domains[col], float(scores[col])
+
+class DomainScoreHolder:
+    """Keeps the shared DomainScoreMatrix in step with the categories and users"""
+
+    def __init__(self):
+        self._matrix = None
+        self._categories = None
+        self._key = None
+        self._lock = threading.Lock()
+
+    def get(self, categories):
+        revision = get_storage().revision('users')
+        with self._lock:
+            # load_json hands out the same object until the file changes
+            if categories is not self._categories:
+                self._categories, self._key = categories, categories_key(categories)
+            matrix = self._matrix
+            if matrix is None or matrix.key != self._key or matrix.revision != revision:
+                matrix = DomainScoreMatrix(categories, self._key, get_storage().all('users'))
+                matrix.revision = revision
+                self._matrix = matrix
+            return matrix
+
+    def apply(self, revisions, records):
+        """Score freshly written {id: profile} records if the matrix was current before the write"""
+        before, after = revisions
+        with self._lock:
+            if self._matrix is not None and self._matrix.revision == before:
+                self._matrix.extend(records.items())
+                self._matrix.revision = after
+
+@shared_resource
+def get_domain_score_holder():
+    """Get the domain score holder shared by all sessions"""
+    return DomainScoreHolder()
+
+def get_domain_score_matrix(categories):
+    """Get the domain score matrix for these categories and the current users"""
+    return get_domain_score_holder().get(categories)
+
+class ProfileFilterIndex:
+    """Posting lists from browse filter values to the users that have them.
+
+    Each (field, value) term maps to the sorted rows of the users posted
+    under it: domains, experience level, availability options and skill
+    keys. Rows follow the users collection order, so intersecting posting
+    lists gives matches in storage order. A re-saved profile keeps its row
+    and just moves between posting lists.
+    """
+
+    FIELDS = ('domain', 'experience', 'availability', 'skill')
+
+    def __init__(self, users=None):
+        self.ids = []  # row -> user record id
+        self.rows = {}  # user record id -> row
+        self.terms = []  # row -> terms the row is posted under
+        self.postings = {field: {} for field in self.FIELDS}  # field -> value -> sorted rows
+        self._arrays = {}  # (field, value) -> posting list as an array, built on first query
+        self.revision = None
+        self.lock = threading.RLock()
+        if users:
+            self.extend(users.items())
+
+    @staticmethod
+    def profile_terms(profile):
+        terms = {('domain', domain) for domain in profile.get('domain', [])}
+        terms.update(('availability', option) for option in profile.get('availability', []))
+        terms.update(('skill', skill_key(skill)) for skill in profile.get('skills', []))
+        terms.add(('experience', profile.get('experience_level')))
+        return terms
+
+    def extend(self, records):
+        """Post new or re-saved (record id, profile) pairs"""
+        with self.lock:
+            for record_id, profile in records:
+                terms = self.profile_terms(profile)
+                row = self.rows.get(record_id)
+                if row is None:
+                    # New rows come last, so appending keeps every posting list sorted
+                    row = self.rows[record_id] = len(self.ids)
+                    self.ids.append(record_id)
+                    self.terms.append(terms)
+                    for field, value in terms:
+                        self.postings[field].setdefault(value, []).append(row)
+                        self._arrays.pop((field, value), None)
+                    continue
+                old_terms, self.terms[row] = self.terms[row], terms
+                for field, value in old_terms - terms:
+                    rows = self.postings[field][value]
+                    rows.remove(row)
+                    if not rows:
+                        del self.postings[field][value]
+                    self._arrays.pop((field, value), None)
+                for field, value in terms - old_terms:
+                    bisect.insort(self.postings[field].setdefault(value, []), row)
+                    self._arrays.pop((field, value), None)
+
+    def _posting(self, term):
+        array = self._arrays.get(term)
+        if array is None:
+            field, value = term
+            array = self._arrays[term] = np.array(self.postings[field].get(value, ()), dtype=np.int64)
+        return array
+
+    def values(self, field):
+        """Sorted distinct values of a field that at least one user has"""
+        with self.lock:
+            return sorted(value for value in self.postings[field] if value is not None)
+
+    def query(self, domain=None, experience=None, availability=None, skills=()):
+        """Record ids of the users matching every given filter, in storage order.
+
+        availability matches users with any of the listed options and skills
+        users with all of them; None or empty filters are skipped.
+        """
+        with self.lock:
+            lists = []
+            if domain is not None:
+                lists.append(self._posting(('domain', domain)))
+            if experience is not None:
+                lists.append(self._posting(('experience', experience)))
+            if availability:
+                lists.append(functools.reduce(np.union1d, (self._posting(('availability', option))
+                                                           for option in availability)))
+            lists.extend(self._posting(('skill', skill_key(skill))) for skill in skills)
+            if not lists:
+                return list(self.ids)
+            lists.sort(key=len)
+            rows = functools.reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+            return [self.ids[row] for row in rows]
+
+class ProfileFilterIndexHolder:
+    """Keeps the shared ProfileFilterIndex in step with the users collection"""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        revision = get_storage().revision('users')
+        with self._lock:
+            if self._index is None or self._index.revision != revision:
+                index = ProfileFilterIndex(get_storage().all('users'))
+                index.revision = revision
+                self._index = index
+            return self._index
+
+    def apply(self, revisions, records):
+        """Post freshly written {id: profile} records if the index was current before the write"""
+        before, after = revisions
+        with self._lock:
+            if self._index is not None and self._index.revision == before:
+                self._index.extend(records.items())
+                self._index.revision = after
+
+@shared_resource
+def get_profile_filter_index_holder():
+    """Get the profile filter index holder shared by all sessions"""
+    return ProfileFilterIndexHolder()
+
+def get_profile_filter_index():
+    """Get the browse filter index for the current users"""
+    return get_profile_filter_index_holder().get()
+
+@timed
+def calculate_domain_scores(user_profile, categories):
+    """Calculate domain match scores for a user"""
+    matrix = get_domain_score_matrix(categories)
+    scores = matrix.scores(user_profile)
+    user_skills = set(map(skill_key, user_profile.get('skills', [])))
+    domain_scores = {}
+    
+    for col, domain in enumerate(matrix.domains):
+        domain_skills = matrix.domain_skills[col]
+        domain_scores[domain] = {
+            'score': float(scores[col]),
+            'matched': {domain_skills[key] for key in user_skills.intersection(domain_skills)},
+            'missing': {domain_skills[key] for key in domain_skills.keys() - user_skills},
+            'category': matrix.categories[col]
+        }
+    
+    return domain_scores
+
+def complementary_scores(matrix, user_profile):
+    """Instant-match score of every matrix row against one user, as an array.
+
+    Same formula as the original per-candidate loop: size of the skill
+    symmetric difference, plus twice the shared availability slots (0.5 if
+    either side has none), plus 0.3 per experience level apart, minus half
+    the shared skills.
+    """
+    with matrix.lock:
+        user_skills = set(map(skill_key, user_profile.get('skills', [])))
+        csr = matrix.matrix()
+        n_rows = csr.shape[0]
+        user_vec = np.zeros(csr.shape[1])
+        user_vec[matrix.skill_columns(user_skills)] = 1
+        shared = csr @ user_vec
+        candidate_sizes = np.diff(matrix._indptr[:n_rows + 1])
+        cand_avail = matrix._availability[:n_rows]
+        cand_exp = matrix._experience[:n_rows]
+
+        # Calculate complementary score (different skills are better for teams)
+        complement_score = len(user_skills) + candidate_sizes - 2 * shared
+        overlap_penalty = shared * 0.5
+
+        # Availability match
+        user_avail = user_profile.get('availability', [])
+        if user_avail:
+            user_mask = np.uint64(availability_mask(user_avail))
+            avail_score = np.where(cand_avail != 0, np.bitwise_count(cand_avail & user_mask), 0.5)
+        else:
+            avail_score = np.full(n_rows, 0.5)
+
+        # Experience diversity bonus
+        user_exp = experience_rank(user_profile)
+        exp_diversity = np.abs(user_exp - cand_exp.astype(np.int64)) * 0.3
+
+        return complement_score + avail_score * 2 + exp_diversity - overlap_penalty
+
+@timed
+def rank_complementary_matches(matrix, user_profile, top_k=3):
+    """Best (profile, score) pairs for a user by complementary_scores"""
+    with matrix.lock:
+        scores = complementary_scores(matrix, user_profile)
+        mask = matrix.candidate_mask(user_profile, require_overlap=False) & (scores > 0)
+        picked = top_k_indices(scores, top_k, mask, matrix.order())
+        return [(matrix.profiles[idx], float(scores[idx])) for idx in picked]
+
+@timed
+def create_instant_team_match(user_profile, hackathon_context=None, top_k=3, matrix=None):
+    """Create instant team matches based on complementary skills and hackathon needs"""
+    if matrix is None:
+        matrix = get_profile_matrix()
+    
+    if len(matrix) < 2:
+        return None
+    
+    return rank_complementary_matches(matrix, user_profile, top_k)
+
+@shared_resource
+def get_match_executor():
+    """Get the thread pool that runs matching for all sessions"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='hackmate-match')
+
+class RoleMatcher:
+    """Scores members against team roles and assigns one role per member.
+
+    Every keyword of every role is a bit. Each distinct skill key is matched
+    against the keywords once and its bits are kept, so scoring a member is
+    an OR over their skills. The members x roles score matrix (keywords hit
+    plus the experience bonus) comes from one bit count, and roles go to
+    members by an optimal assignment rather than each role picking its own
+    best member.
+    """
+
+    def __init__(self, roles):
+        self.roles = list(roles)
+        self.keywords = []
+        self.role_masks = np.zeros(len(self.roles), dtype=np.uint64)
+        for col, role in enumerate(self.roles):
+            for keyword in roles[role]:
+                self.role_masks[col] |= np.uint64(1 << len(self.keywords))
+                self.keywords.append(_compact_skill(keyword))
+        self.role_keywords = {role: list(keywords) for role, keywords in roles.items()}
+        self._skill_bits = {}  # skill key -> bits of the keywords it contains
+
+    def skill_bits(self, skill):
+        key = skill_key(skill)
+        bits = self._skill_bits.get(key)
+        if bits is None:
+            bits = self._skill_bits[key] = sum(1 << bit for bit, keyword in enumerate(self.keywords)
+                                               if keyword in key)
+        return bits
+
+    def scores(self, members):
+        """members x roles score matrix"""
+        masks = np.zeros(len(members), dtype=np.uint64)
+        bonus = np.empty(len(members))
+        for row, member in enumerate(members):
+            bits = 0
+            for skill in member.get('skills', []):
+                bits |= self.skill_bits(skill)
+            masks[row] = bits
+            bonus[row] = ROLE_EXPERIENCE_BONUS.get(member.get('experience_level', 'Intermediate'), 1)
+        return np.bitwise_count(masks[:, None] & self.role_masks[None, :]) + bonus[:, None]
+
+    def assign(self, members, scores=None):
+        """Role name -> {'skills', 'assigned', 'score'} with the highest total score.
+
+        A member gets at most one role; with fewer members than roles the
+        rest stay unassigned, with more some members get none.
+        """
+        from scipy.optimize import linear_sum_assignment
+        if scores is None:
+            scores = self.scores(members)
+        roles = {role: {'skills': list(keywords), 'assigned': None}
+                 for role, keywords in self.role_keywords.items()}
+        if len(members):
+            rows, cols = linear_sum_assignment(scores, maximize=True)
+            for row, col in zip(rows, cols):
+                role = roles[self.roles[col]]
+                role['assigned'] = members[row]['name']
+                role['score'] = float(scores[row, col])
+        return roles
+
+    def assign_many(self, teams):
+        """assign() for many teams, scoring all of their members in one pass"""
+        members = [member for team in teams for member in team]
+        scores = self.scores(members)
+        assigned, start = [], 0
+        for team in teams:
+            assigned.append(self.assign(team, scores[start:start + len(team)]))
+            start += len(team)
+        return assigned
+
+ROLE_MATCHER = RoleMatcher(TEAM_ROLES)
+
+@timed
+def generate_team_roles(team_members, hackathon_theme=None):
+    """Generate optimal role assignments for team members"""
+    return ROLE_MATCHER.assign(team_members)
+
+def generate_roles_for_teams(teams):
+    """generate_team_roles for a batch of teams, such as a whole cohort"""
+    return ROLE_MATCHER.assign_many(teams)
+
+def compatibility_features(member):
+    """The parts of a member profile that team compatibility depends on"""
+    return (profile_skill_mask(member),
+            len(member.get('skills', [])),
+            experience_rank(member),
+            profile_availability_mask(member) if member.get('availability') else None,
+            member.get('domain', []))
+
+def _compatibility_score(size, unique_skills, total_skills, experience_levels, shared_availability, domains):
+    """Team compatibility from team totals; shared_availability is None when no member gave one"""
+    # Skill diversity score
+    skill_diversity = unique_skills / (total_skills + 1) if total_skills > 0 else 0
+    
+    # Experience level balance
+    exp_variety = experience_levels / size
+    
+    # Availability overlap
+    if shared_availability is not None:
+        avail_score = shared_availability / 5  # Assuming max 5 availability options
+    else:
+        avail_score = 0.5
+    
+    # Domain diversity
+    domain_diversity = domains / size
+    
+    total_score = (skill_diversity * 0.4 + exp_variety * 0.2 + avail_score * 0.2 + domain_diversity * 0.2) * 100
+    return min(100, total_score)
+
+def compatibility_from_features(features):
+    """Team compatibility score from the members' compatibility_features"""
+    if len(features) < 2:
+        return 0
+    all_skills = 0
+    total_skills = 0
+    common_avail = None
+    domains = set()
+    for skill_mask, skill_count, _, availability, member_domains in features:
+        all_skills |= skill_mask
+        total_skills += skill_count
+        if availability is not None:
+            common_avail = availability if common_avail is None else common_avail & availability
+        domains.update(member_domains)
+    return _compatibility_score(len(features), all_skills.bit_count(), total_skills,
+                                len(set(feature[2] for feature in features)),
+                                None if common_avail is None else common_avail.bit_count(), len(domains))
+
+def _count(counts, keys, step):
+    for key in keys:
+        count = counts.get(key, 0) + step
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
+
+class TeamStats:
+    """Sufficient statistics of a team's compatibility, updated member by member.
+
+    Keeps per-skill, per-experience-rank and per-domain member counts and,
+    for the members who gave an availability, how many have each option.
+    add and remove cost O(skills + domains) of that member. TeamStatsCache
+    keeps one per team so a membership change only touches the members who
+    joined or left, and team_addition_scores scores every candidate against
+    one team's counts at once. CohortSolver, which rescores small teams
+    millions of times, is faster OR-ing the members' bitmasks with
+    compatibility_from_features.
+    """
+
+    def __init__(self, members=()):
+        self.size = 0
+        self.skill_counts = {}  # skill key -> members with it
+        self.total_skills = 0
+        self.experience_counts = {}  # experience_rank -> members at it
+        self.availability_members = 0  # members who gave an availability
+        self.availability_counts = {}  # availability bit -> members with it
+        self.domain_counts = {}  # domain -> members in it
+        for member in members:
+            self.add(member)
+
+    def _update(self, member, step):
+        self.size += step
+        _count(self.skill_counts, profile_skill_keys(member), step)
+        self.total_skills += step * len(member.get('skills', []))
+        _count(self.experience_counts, (experience_rank(member),), step)
+        if member.get('availability'):
+            mask = profile_availability_mask(member)
+            self.availability_members += step
+            _count(self.availability_counts, (bit for bit in range(mask.bit_length()) if mask >> bit & 1), step)
+        _count(self.domain_counts, set(member.get('domain', [])), step)
+
+    def add(self, member):
+        self._update(member, 1)
+
+    def remove(self, member):
+        """Undo add(member); member must be the profile as it was added"""
+        self._update(member, -1)
+
+    @property
+    def compatibility(self):
+        """Team compatibility score, 0 for teams of fewer than two"""
+        if self.size < 2:
+            return 0
+        shared = None
+        if self.availability_members:
+            shared = sum(1 for count in self.availability_counts.values() if count == self.availability_members)
+        return _compatibility_score(self.size, len(self.skill_counts), self.total_skills,
+                                    len(self.experience_counts), shared, len(self.domain_counts))
+
+@timed
+def calculate_team_compatibility(members):
+    """Calculate overall team compatibility score"""
+    if len(members) < 2:
+        return 0
+    return TeamStats(members).compatibility
+
+class TeamStatsCache:
+    """TeamStats of recently saved or changed teams, kept up to date member by member.
+
+    Each entry holds a team's member ids, the profiles as they were added
+    and their TeamStats. A new member list for the team is applied as
+    remove() of the members who left and add() of those who joined; a team
+    without an entry, or whose stored members no longer match it, is
+    counted from scratch.
+    """
+
+    SIZE = 1024
+
+    def __init__(self):
+        self._teams = {}  # (collection, team id) -> (member ids, id -> profile, TeamStats), LRU first
+        self._lock = threading.Lock()
+
+    def seed(self, collection, team_id, member_ids, members):
+        """Start tracking a team with the given members"""
+        with self._lock:
+            self._store((collection, team_id), (list(member_ids), dict(zip(member_ids, members)), TeamStats(members)))
+
+    def change(self, collection, team_id, old_ids, member_ids, members):
+        """TeamStats of a team whose member list goes from old_ids to member_ids (profiles members)"""
+        key = (collection, team_id)
+        with self._lock:
+            entry = self._teams.pop(key, None)
+            if entry is None or entry[0] != list(old_ids):
+                entry = (list(member_ids), dict(zip(member_ids, members)), TeamStats(members))
+            else:
+                _, profiles, stats = entry
+                new = dict(zip(member_ids, members))
+                for member_id in set(profiles) - set(new):
+                    stats.remove(profiles.pop(member_id))
+                for member_id in set(new) - set(profiles):
+                    profiles[member_id] = new[member_id]
+                    stats.add(new[member_id])
+                entry = (list(member_ids), profiles, stats)
+            self._store(key, entry)
+            return entry[2]
+
+    def _store(self, key, entry):
+        self._teams[key] = entry
+        while len(self._teams) > self.SIZE:
+            del self._teams[next(iter(self._teams))]
+
+@shared_resource
+def get_team_stats_cache():
+    """Get the per-team statistics cache shared by all sessions"""
+    return TeamStatsCache()
+
+def focus_domain(focus_area, categories):
+    """(category, domain) of the first category with focus_area among its domains, or None"""
+    for category, info in (categories or {}).items():
+        if focus_area in info.get('domains', {}):
+            return category, focus_area
+    return None
+
+def team_addition_scores(matrix, members, focus=None, categories=None):
+    """Gain from adding each matrix row to a team: (compatibility gains, fit gains, missing skills).
+
+    The compatibility after adding a row is what calculate_team_compatibility
+    gives for the team plus that profile, computed for every row at once from
+    the team's TeamStats and the matrix's per-row columns. The fit gain is
+    how far analyze_fit's score for the focus (category, domain) rises when
+    the row's skills join the team's; missing is the set of domain skills
+    the team lacks.
+    """
+    stats = TeamStats(members)
+    size = stats.size + 1
+    team_skills = [skill for member in members for skill in member.get('skills', [])]
+    fit = analyze_fit(*focus, team_skills, categories) if focus else None
+    with matrix.lock:
+        csr = matrix.matrix()
+        n_rows = csr.shape[0]
+        team_vec = np.zeros(csr.shape[1])
+        team_vec[matrix.skill_columns(team_skills)] = 1
+        unique_skills = len(stats.skill_counts) + np.diff(matrix._indptr[:n_rows + 1]) - csr @ team_vec
+        total_skills = stats.total_skills + matrix._skill_totals[:n_rows]
+        experience_levels = (len(stats.experience_counts)
+                             + ~np.isin(matrix._experience[:n_rows], list(stats.experience_counts)))
+        cand_avail = matrix._availability[:n_rows]
+        shared_domains = np.zeros(n_rows, dtype=np.int32)
+        for domain in stats.domain_counts:
+            shared_domains[matrix.domain_rows.get(domain, [])] += 1
+        domains = len(stats.domain_counts) + matrix._domain_totals[:n_rows] - shared_domains
+
+        # Same formula as _compatibility_score, one row per candidate
+        if size < 2:
+            gains = np.zeros(n_rows)
+        else:
+            skill_diversity = np.divide(unique_skills, total_skills + 1, out=np.zeros(n_rows), where=total_skills > 0)
+            if stats.availability_members:
+                common = sum(1 << bit for bit, count in stats.availability_counts.items()
+                             if count == stats.availability_members)
+                common = np.uint64(common)
+                avail_score = np.bitwise_count(np.where(cand_avail != 0, cand_avail & common, common)) / 5
+            else:
+                avail_score = np.where(cand_avail != 0, np.bitwise_count(cand_avail) / 5, 0.5)
+            compatibility = np.minimum(100, (skill_diversity * 0.4 + experience_levels / size * 0.2
+                                             + avail_score * 0.2 + domains / size * 0.2) * 100)
+            gains = compatibility - stats.compatibility
+
+        fit_gains = np.zeros(n_rows)
+        missing = set()
+        if fit is not None and fit['missing']:
+            missing = fit['missing']
+            missing_vec = np.zeros(csr.shape[1])
+            missing_vec[matrix.skill_columns(missing)] = 1
+            category, domain = focus
+            max_score = max(len(set(map(skill_key, categories[category]['domains'][domain]))), 10)
+            matched = len(fit['matched'])
+            fit_gains = (np.minimum(100, (matched + csr @ missing_vec) / max_score * 100)
+                         - min(100, matched / max_score * 100))
+    return gains, fit_gains, missing
+
+@timed
+def rank_team_additions(matrix, members, top_k=5, focus=None, categories=None):
+    """Best (profile, score, covered skills) additions to a team.
+
+    score is the compatibility gain plus the focus-domain fit gain, both in
+    percentage points; covered lists the missing domain skills the profile
+    brings. Current members and anyone who would add nothing are skipped.
+    """
+    with matrix.lock:
+        gains, fit_gains, missing = team_addition_scores(matrix, members, focus, categories)
+        scores = gains + fit_gains
+        mask = matrix._alive[:len(scores)] & (scores > 0)
+        for member in members:
+            mask[list(matrix.name_rows.get(member.get('name'), ()))] = False
+        picked = top_k_indices(scores, top_k, mask, matrix.order())
+        missing_keys = {skill_key(skill): skill for skill in missing}
+        return [(matrix.profiles[idx], float(scores[idx]),
+                 sorted({missing_keys[key] for key in map(skill_key, matrix.profiles[idx].get('skills', []))
+                         if key in missing_keys}))
+                for idx in picked]
+
+@timed
+def assemble_team(user_profile, team_size, beam_width=None, time_budget=None, matrix=None):
+    """Grow a team of team_size around a user by beam search on whole-team compatibility.
+
+    Every team in the beam is extended by each of its beam_width best
+    additions, ranked by the compatibility of the grown team
+    (team_addition_scores), and the beam_width best distinct teams go on to
+    the next step. Once time_budget seconds have passed the beam narrows to
+    one team, so the remaining members are added greedily. Returns
+    (members, compatibility) with the user first; the team only comes back
+    short of team_size when there are not enough other users.
+    """
+    beam_width = TEAM_BEAM_WIDTH if beam_width is None else beam_width
+    time_budget = TEAM_ASSEMBLY_BUDGET if time_budget is None else time_budget
+    if matrix is None:
+        matrix = get_profile_matrix()
+    start = time.perf_counter()
+    with matrix.lock:
+        candidates = matrix.candidate_mask(user_profile, require_overlap=False)
+        order = matrix.order()
+        beam = [()]  # teams as the rows added so far, in the order they were added
+        for _ in range(team_size - 1):
+            width = beam_width if time.perf_counter() - start < time_budget else 1
+            grown = {}  # member set -> (compatibility, rows)
+            for rows in beam[:width]:
+                members = [user_profile] + [matrix.profiles[row] for row in rows]
+                gains, _, _ = team_addition_scores(matrix, members)
+                scores = gains + calculate_team_compatibility(members)
+                mask = candidates.copy()
+                mask[list(rows)] = False
+                for row in top_k_indices(scores, width, mask, order):
+                    key = frozenset(rows + (row,))
+                    if key not in grown:
+                        grown[key] = (scores[row], rows + (row,))
+            if not grown:
+                break
+            # Stable sort, so ties keep the order the teams were grown in
+            beam = [rows for _, rows in sorted(grown.values(), key=lambda item: -item[0])[:width]]
+        members = [user_profile] + [matrix.profiles[row] for row in beam[0]]
+    return members, calculate_team_compatibility(members)
+
+class TeamRecommendationCache:
+    """The most recent recommend_team_members results, keyed by team version"""
+
+    SIZE = 256
+
+    def __init__(self):
+        self._results = {}  # key -> result, least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            result = self._results.pop(key, None)
+            if result is not None:
+                self._results[key] = result
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.SIZE:
+                del self._results[next(iter(self._results))]
+
+@shared_resource
+def get_team_recommendation_cache():
+    """Get the team recommendation cache shared by all sessions"""
+    return TeamRecommendationCache()
+
+@timed
+def recommend_team_members(team_id, top_k=5, categories=None):
+    """Users who would best fill a team's open slots, as rank_team_additions triples.
+
+    Looks the team up in both team collections. Results are cached per team
+    version: its members and focus area, the users revision (so profile
+    edits count) and the categories.
+    """
+    storage = get_storage()
+    for collection in TEAM_COLLECTIONS:
+        team = storage.get(collection, team_id)
+        if team:
+            break
+    else:
+        return []
+    if categories is None:
+        categories = load_json(CATEGORIES_FILE)
+    matrix = get_profile_matrix()
+    key = (collection, team_id, tuple(team.get('member_ids', ())), team.get('focus_area'), top_k,
+           matrix.revision, categories_key(categories))
+    cache = get_team_recommendation_cache()
+    result = cache.get(key)
+    if result is None:
+        members = join_team_members([team])[0].get('members', [])
+        result = rank_team_additions(matrix, members, top_k,
+                                     focus_domain(team.get('focus_area'), categories), categories)
+        cache.put(key, result)
+    return result
+
+class CohortSolver:
+    """Splits a whole cohort into teams with the highest total compatibility.
+
+    Users are pooled by preferred team size (2 to 6; a pool left with a
+    single user joins the next one) and each pool is cut into teams of
+    about that size. Simulated annealing then swaps members between teams
+    of the same pool, so team sizes never change, and keeps the best
+    partition seen before the time budget runs out.
+    """
+
+    START_TEMPERATURE = 5.0
+    END_TEMPERATURE = 0.01
+
+    def __init__(self, profiles, default_size=4, seed=None):
+        self.profiles = list(profiles)
+        self.features = [compatibility_features(profile) for profile in self.profiles]
+        self.rng = random.Random(seed)
+        self.pools = self._initial_pools(default_size)  # pool -> teams -> profile indices
+
+    def _initial_pools(self, default_size):
+        by_size = {}
+        for idx, profile in enumerate(self.profiles):
+            size = min(6, max(2, int(profile.get('preferred_team_size') or default_size)))
+            by_size.setdefault(size, []).append(idx)
+        pools = []
+        for size in sorted(by_size):
+            members = by_size[size]
+            if pools and len(pools[-1][1]) < 2:
+                members = pools.pop()[1] + members
+            pools.append((size, members))
+        if len(pools) > 1 and len(pools[-1][1]) < 2:
+            pools[-2][1].extend(pools.pop()[1])
+        teams = []
+        for size, members in pools:
+            self.rng.shuffle(members)
+            count = max(1, round(len(members) / size))
+            teams.append([members[i::count] for i in range(count)])
+        return teams
+
+    def team_score(self, team):
+        """Compatibility of a team of profile indices"""
+        return compatibility_from_features([self.features[idx] for idx in team])
+
+    def solve(self, time_budget=10.0, max_iterations=None):
+        """Anneal for up to time_budget seconds; returns (members, compatibility) pairs, best first"""
+        scores = [[self.team_score(team) for team in teams] for teams in self.pools]
+        swappable = [p for p, teams in enumerate(self.pools) if len(teams) > 1]
+        weights = [sum(len(team) for team in self.pools[p]) for p in swappable]
+        total = best_total = sum(map(sum, scores))
+        best = [[list(team) for team in teams] for teams in self.pools]
+        start = time.perf_counter()
+        iteration = 0
+        temperature = self.START_TEMPERATURE
+        while swappable:
+            if iteration % 256 == 0:
+                progress = (time.perf_counter() - start) / time_budget if time_budget else 1
+                if progress >= 1 or (max_iterations is not None and iteration >= max_iterations):
+                    break
+                temperature = self.START_TEMPERATURE * (self.END_TEMPERATURE / self.START_TEMPERATURE) ** progress
+            iteration += 1
+            p = self.rng.choices(swappable, weights)[0]
+            teams, team_scores = self.pools[p], scores[p]
+            a, b = self.rng.sample(range(len(teams)), 2)
+            i, j = self.rng.randrange(len(teams[a])), self.rng.randrange(len(teams[b]))
+            teams[a][i], teams[b][j] = teams[b][j], teams[a][i]
+            score_a, score_b = self.team_score(teams[a]), self.team_score(teams[b])
+            delta = score_a + score_b - team_scores[a] - team_scores[b]
+            if delta >= 0 or self.rng.random() < math.exp(delta / temperature):
+                team_scores[a], team_scores[b] = score_a, score_b
+                total += delta
+                if total > best_total + 1e-9:
+                    best_total = total
+                    best = [[list(team) for team in teams] for teams in self.pools]
+            else:
+                teams[a][i], teams[b][j] = teams[b][j], teams[a][i]
+        self.iterations = iteration
+        self.pools = best
+        result = [([self.profiles[idx] for idx in team], self.team_score(team))
+                  for teams in best for team in teams]
+        result.sort(key=lambda x: x[1], reverse=True)
+        return result
+
+@timed
+def form_cohort_teams(profiles=None, time_budget=10.0, seed=None, save=True):
+    """Split a whole cohort into teams with the highest total compatibility.
+
+    Defaults to every user opted in to quick team matching. Returns
+    (members, compatibility) pairs, best first; with save, each team is
+    also stored as a quick team.
+    """
+    if profiles is None:
+        profiles = [user for user in get_all_users() if user.get('quick_team_opt_in')]
+    teams = CohortSolver(profiles, seed=seed).solve(time_budget)
+    if save:
+        formed = datetime.now()
+        roles = generate_roles_for_teams([members for members, _ in teams])
+        save_quick_teams([{
+            'name': new_team_name(f"CohortTeam_{number}"),
+            'members': members,
+            'target_size': len(members),
+            'formation_time': formed.strftime('%H:%M:%S'),
+            'compatibility': compatibility,
+            'roles': team_roles,
+            'type': 'cohort'
+        } for number, ((members, compatibility), team_roles) in enumerate(zip(teams, roles), 1)])
+    return teams
+
+def team_page(cursor=None, limit=10, newest_first=False):
+    """One page of (record id, team) pairs: regular teams then quick teams, or newest first.
+
+    cursor is None or the (collection, record id) pair returned by the
+    previous call; the returned cursor is None after the last page.
+    """
+    storage = get_storage()
+    collections = ['quick_teams', 'teams'] if newest_first else ['teams', 'quick_teams']
+    collection, record_cursor = cursor or (collections[0], None)
+    position = collections.index(collection)
+    items = []
+    while True:
+        batch, record_cursor = storage.page(collection, record_cursor, limit - len(items), reverse=newest_first)
+        items.extend(batch)
+        if record_cursor is not None:
+            return items, (collection, record_cursor)
+        position += 1
+        if position == len(collections):
+            return items, None
+        collection = collections[position]
+        if len(items) == limit:
+            return items, ((collection, None) if storage.count(collection) else None)
+
+def create_sample_categories():
+    """Create sample categories"""
+    sample_categories = copy.deepcopy(SAMPLE_CATEGORIES)
+    save_json(CATEGORIES_FILE, sample_categories)
+    return sample_categories
+
+def create_sample_users():
+    """Create sample users for demonstration"""
+    created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    sample_users = [{**copy.deepcopy(user), "created_date": created_date} for user in SAMPLE_USERS]
+    
+    # Save sample users
+    users_data = {user["name"]: encode_profile(user) for user in sample_users}
+    get_storage().put_many('users', users_data)
+    return sample_users
+
+def initialize_sample_data():
+    """Initialize sample data if no data exists"""
+    if not get_all_users():
+        create_sample_users()
+    
+    if not os.path.exists(CATEGORIES_FILE) or not load_json(CATEGORIES_FILE):
+        create_sample_categories()